@@ -4,271 +4,31 @@ import os
 import subprocess
 import threading
 import re
-import json
-import locale
+import signal
 import time
-from pathlib import Path
+import shutil
+from collections import deque
 from PyQt5 import QtWidgets, QtGui
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QPushButton, QLabel, QFrame,
                              QTextEdit, QProgressBar, QMessageBox, QCheckBox, QComboBox,
                              QInputDialog)
 from PyQt5.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve, pyqtProperty, pyqtSignal, QObject
-from PyQt5.QtGui import (QIcon, QFont, QPalette, QColor, QPainter, QFontDatabase, QTextCursor)
+from PyQt5.QtGui import (QIcon, QFont, QPalette, QColor, QPainter)
+
+import grub_config
+from styles import button_selector, register_stylesheet, apply_button_style, ButtonPixmapCache, load_app_font
+from localization import LanguageManager
+from output_console import OutputConsole
+from root_helper import RootHelper
+from hardware import (GPU_VENDORS, scan_display_devices, lookup_pci_name,
+                      pci_fingerprint, load_cached_gpus, save_cached_gpus, nvidia_branch_for_device)
+from pacman_tools import (PACMAN_LOCK, read_local_packages, read_sync_versions, filter_installed,
+                          wait_for_lock_release, pacman_lock_holders, parse_fuser_pids, process_name,
+                          list_mkinitcpio_presets, keyring_state, initramfs_affecting_packages, presets_for_dkms, InstallProgress)
 
 os.environ['XDG_RUNTIME_DIR'] = '/tmp/runtime-root'
 
-LOCALES = {
-    'en': {
-        'app_title': 'EN-OS Driver Manager',
-        'header': '🛠️ EN-OS Driver Manager',
-        'hardware_detection': 'Hardware Detection',
-        'detecting_hardware': 'Detecting graphics cards...',
-        'driver_installation': 'Driver Installation',
-        'system_update': 'Update system before installation',
-        'nomodeset': 'Add nomodeset to GRUB (fix graphics issues)',
-        'install_nvidia': '🟢 Install NVIDIA Drivers',
-        'install_amd': '🔵 Install AMD Drivers',
-        'install_intel': '🟡 Install Intel Drivers',
-        'console_output': 'Installation Output:',
-        'install_btn': '✔️ Start Installation',
-        'clear_btn': '🗑️ Clear Output',
-        'language': 'Language',
-        'error_title': 'Error',
-        'success_title': 'Success',
-        'confirm_install': 'Confirm Installation',
-        'install_confirm_msg': 'Install {} drivers? This may take several minutes.',
-        'operation_started': 'Operation started...',
-        'operation_completed': 'Operation completed successfully!',
-        'operation_failed': 'Operation failed!',
-        'no_drivers_selected': 'Please select at least one driver to install',
-        'hardware_info': 'Detected Graphics Cards:',
-        'gpu_detected': 'GPU detected:',
-        'no_gpu_detected': 'No compatible graphics cards detected',
-        'need_root': 'Root access required',
-        'need_root_msg': 'This operation requires root privileges. Please enter your password.',
-        'install_success': 'Drivers installed successfully!',
-        'install_failed': 'Driver installation failed'
-    },
-    'ru': {
-        'app_title': 'EN-OS Driver Manager',
-        'header': '🛠️ EN-OS Driver Manager',
-        'hardware_detection': 'Обнаружение оборудования',
-        'detecting_hardware': 'Определение видеокарт...',
-        'driver_installation': 'Установка драйверов',
-        'system_update': 'Обновить систему перед установкой (иногда разрешает конфликты пакетов)',
-        'nomodeset': 'Добавить nomodeset в GRUB (решение проблем с графикой)',
-        'install_nvidia': '🟢 Установить драйверы NVIDIA',
-        'install_amd': '🟢 Установить драйверы AMD',
-        'install_intel': '🟡 Установить драйверы Intel',
-        'console_output': 'Вывод установки:',
-        'install_btn': '✔️ Начать установку',
-        'clear_btn': '🗑️ Очистить вывод',
-        'language': 'Язык',
-        'error_title': 'Ошибка',
-        'success_title': 'Успех',
-        'confirm_install': 'Подтверждение установки',
-        'install_confirm_msg': 'Установить драйверы {}? Это может занять несколько минут.',
-        'operation_started': 'Операция запущена...',
-        'operation_completed': 'Операция успешно завершена!',
-        'operation_failed': 'Операция не удалась!',
-        'no_drivers_selected': 'Пожалуйста, выберите хотя бы один драйвер для установки',
-        'hardware_info': 'Обнаруженные видеокарты:',
-        'gpu_detected': 'Видеокарта обнаружена:',
-        'no_gpu_detected': 'Совместимые видеокарты не обнаружены',
-        'need_root': 'Требуются права sudo',
-        'need_root_msg': 'Эта операция требует прав sudo. Пожалуйста, введите ваш пароль.',
-        'install_success': 'Драйверы успешно установлены!',
-        'install_failed': 'Ошибка установки драйверов'
-    },
-    'es': {
-        'app_title': 'Gestor de Controladores EN-OS',
-        'header': '🛠️ Gestor de Controladores EN-OS',
-        'hardware_detection': 'Detección de Hardware',
-        'detecting_hardware': 'Detectando tarjetas gráficas...',
-        'driver_installation': 'Instalación de Controladores',
-        'system_update': 'Actualizar el sistema antes de la instalación',
-        'nomodeset': 'Añadir nomodeset a GRUB (soluciona problemas gráficos)',
-        'install_nvidia': '🟢 Instalar controladores NVIDIA',
-        'install_amd': '🔵 Instalar controladores AMD',
-        'install_intel': '🟡 Instalar controladores Intel',
-        'console_output': 'Salida de instalación:',
-        'install_btn': '✔️ Iniciar Instalación',
-        'clear_btn': '🗑️ Limpiar Salida',
-        'language': 'Idioma',
-        'error_title': 'Error',
-        'success_title': 'Éxito',
-        'confirm_install': 'Confirmar Instalación',
-        'install_confirm_msg': '¿Instalar controladores {}? Esto puede tomar varios minutos.',
-        'operation_started': 'Operación iniciada...',
-        'operation_completed': '¡Operación completada con éxito!',
-        'operation_failed': '¡La operación falló!',
-        'no_drivers_selected': 'Por favor, selecciona al menos un controlador para instalar',
-        'hardware_info': 'Tarjetas Gráficas Detectadas:',
-        'gpu_detected': 'GPU detectada:',
-        'no_gpu_detected': 'No se detectaron tarjetas gráficas compatibles',
-        'need_root': 'Se requieren privilegios de root',
-        'need_root_msg': 'Esta operación requiere privilegios de administrador. Por favor, introduce tu contraseña.',
-        'install_success': '¡Controladores instalados correctamente!',
-        'install_failed': 'Fallo al instalar los controladores'
-    },
-    'fr': {
-        'app_title': 'Gestionnaire de pilotes EN-OS',
-        'header': '🛠️ Gestionnaire de pilotes EN-OS',
-        'hardware_detection': 'Détection du matériel',
-        'detecting_hardware': 'Détection des cartes graphiques...',
-        'driver_installation': 'Installation des pilotes',
-        'system_update': 'Mettre à jour le système avant l\'installation',
-        'nomodeset': 'Ajouter nomodeset à GRUB (résout les problèmes graphiques)',
-        'install_nvidia': '🟢 Installer les pilotes NVIDIA',
-        'install_amd': '🔵 Installer les pilotes AMD',
-        'install_intel': '🟡 Installer les pilotes Intel',
-        'console_output': 'Sortie d\'installation :',
-        'install_btn': '✔️ Démarrer l\'installation',
-        'clear_btn': '🗑️ Effacer la sortie',
-        'language': 'Langue',
-        'error_title': 'Erreur',
-        'success_title': 'Succès',
-        'confirm_install': 'Confirmer l\'installation',
-        'install_confirm_msg': 'Installer les pilotes {} ? Cela peut prendre plusieurs minutes.',
-        'operation_started': 'Opération démarrée...',
-        'operation_completed': 'Opération terminée avec succès !',
-        'operation_failed': 'L\'opération a échoué !',
-        'no_drivers_selected': 'Veuillez sélectionner au moins un pilote à installer',
-        'hardware_info': 'Cartes graphiques détectées :',
-        'gpu_detected': 'GPU détecté :',
-        'no_gpu_detected': 'Aucune carte graphique compatible détectée',
-        'need_root': 'Privilèges root requis',
-        'need_root_msg': 'Cette opération nécessite des privilèges d\'administrateur. Veuillez entrer votre mot de passe.',
-        'install_success': 'Pilotes installés avec succès !',
-        'install_failed': 'Échec de l\'installation des pilotes'
-    },
-    'de': {
-        'app_title': 'EN-OS Treiber-Manager',
-        'header': '🛠️ EN-OS Treiber-Manager',
-        'hardware_detection': 'Hardware-Erkennung',
-        'detecting_hardware': 'Grafikkarten werden erkannt...',
-        'driver_installation': 'Treiberinstallation',
-        'system_update': 'System vor der Installation aktualisieren',
-        'nomodeset': 'nomodeset zu GRUB hinzufügen (behebt Grafikprobleme)',
-        'install_nvidia': '🟢 NVIDIA-Treiber installieren',
-        'install_amd': '🔵 AMD-Treiber installieren',
-        'install_intel': '🟡 Intel-Treiber installieren',
-        'console_output': 'Installationsausgabe:',
-        'install_btn': '✔️ Installation starten',
-        'clear_btn': '🗑️ Ausgabe löschen',
-        'language': 'Sprache',
-        'error_title': 'Fehler',
-        'success_title': 'Erfolg',
-        'confirm_install': 'Installation bestätigen',
-        'install_confirm_msg': '{} Treiber installieren? Dies kann mehrere Minuten dauern.',
-        'operation_started': 'Vorgang gestartet...',
-        'operation_completed': 'Vorgang erfolgreich abgeschlossen!',
-        'operation_failed': 'Vorgang fehlgeschlagen!',
-        'no_drivers_selected': 'Bitte wählen Sie mindestens einen Treiber zur Installation aus',
-        'hardware_info': 'Erkannte Grafikkarten:',
-        'gpu_detected': 'GPU erkannt:',
-        'no_gpu_detected': 'Keine kompatiblen Grafikkarten erkannt',
-        'need_root': 'Root-Rechte erforderlich',
-        'need_root_msg': 'Diese Operation erfordert Root-Rechte. Bitte geben Sie Ihr Passwort ein.',
-        'install_success': 'Treiber erfolgreich installiert!',
-        'install_failed': 'Treiberinstallation fehlgeschlagen'
-    },
-    'zh_CN': {
-        'app_title': 'EN-OS 驱动管理器',
-        'header': '🛠️ EN-OS 驱动管理器',
-        'hardware_detection': '硬件检测',
-        'detecting_hardware': '正在检测显卡...',
-        'driver_installation': '驱动安装',
-        'system_update': '安装前更新系统',
-        'nomodeset': '在 GRUB 中添加 nomodeset（修复图形问题）',
-        'install_nvidia': '🟢 安装 NVIDIA 驱动',
-        'install_amd': '🔵 安装 AMD 驱动',
-        'install_intel': '🟡 安装 Intel 驱动',
-        'console_output': '安装输出：',
-        'install_btn': '✔️ 开始安装',
-        'clear_btn': '🗑️ 清除输出',
-        'language': '语言',
-        'error_title': '错误',
-        'success_title': '成功',
-        'confirm_install': '确认安装',
-        'install_confirm_msg': '是否安装 {} 驱动？此过程可能需要几分钟。',
-        'operation_started': '操作开始...',
-        'operation_completed': '操作成功完成！',
-        'operation_failed': '操作失败！',
-        'no_drivers_selected': '请选择至少一个要安装的驱动',
-        'hardware_info': '检测到的显卡：',
-        'gpu_detected': '检测到显卡：',
-        'no_gpu_detected': '未检测到兼容的显卡',
-        'need_root': '需要 root 权限',
-        'need_root_msg': '此操作需要管理员权限。请输入您的密码。',
-        'install_success': '驱动安装成功！',
-        'install_failed': '驱动安装失败'
-    },
-    'ja': {
-        'app_title': 'EN-OS ドライバーマネージャー',
-        'header': '🛠️ EN-OS ドライバーマネージャー',
-        'hardware_detection': 'ハードウェア検出',
-        'detecting_hardware': 'グラフィックカードを検出中...',
-        'driver_installation': 'ドライバーインストール',
-        'system_update': 'インストール前にシステムを更新',
-        'nomodeset': 'GRUB に nomodeset を追加（グラフィック問題の修正）',
-        'install_nvidia': '🟢 NVIDIA ドライバーをインストール',
-        'install_amd': '🔵 AMD ドライバーをインストール',
-        'install_intel': '🟡 Intel ドライバーをインストール',
-        'console_output': 'インストール出力：',
-        'install_btn': '✔️ インストール開始',
-        'clear_btn': '🗑️ 出力クリア',
-        'language': '言語',
-        'error_title': 'エラー',
-        'success_title': '成功',
-        'confirm_install': 'インストールの確認',
-        'install_confirm_msg': '{} ドライバーをインストールしますか？数分かかる可能性があります。',
-        'operation_started': '操作を開始しました...',
-        'operation_completed': '操作が正常に完了しました！',
-        'operation_failed': '操作に失敗しました！',
-        'no_drivers_selected': 'インストールするドライバーを少なくとも1つ選択してください',
-        'hardware_info': '検出されたグラフィックカード：',
-        'gpu_detected': 'GPU検出：',
-        'no_gpu_detected': '互換性のあるグラフィックカードが見つかりません',
-        'need_root': 'root権限が必要です',
-        'need_root_msg': 'この操作には管理者権限が必要です。パスワードを入力してください。',
-        'install_success': 'ドライバーのインストールに成功しました！',
-        'install_failed': 'ドライバーのインストールに失敗しました'
-    },
-    'ko': {
-        'app_title': 'EN-OS 드라이버 매니저',
-        'header': '🛠️ EN-OS 드라이버 매니저',
-        'hardware_detection': '하드웨어 감지',
-        'detecting_hardware': '그래픽 카드 감지 중...',
-        'driver_installation': '드라이버 설치',
-        'system_update': '설치 전 시스템 업데이트',
-        'nomodeset': 'GRUB에 nomodeset 추가 (그래픽 문제 해결)',
-        'install_nvidia': '🟢 NVIDIA 드라이버 설치',
-        'install_amd': '🔵 AMD 드라이버 설치',
-        'install_intel': '🟡 Intel 드라이버 설치',
-        'console_output': '설치 출력:',
-        'install_btn': '✔️ 설치 시작',
-        'clear_btn': '🗑️ 출력 지우기',
-        'language': '언어',
-        'error_title': '오류',
-        'success_title': '성공',
-        'confirm_install': '설치 확인',
-        'install_confirm_msg': '{} 드라이버를 설치하시겠습니까? 몇 분 정도 걸릴 수 있습니다.',
-        'operation_started': '작업 시작...',
-        'operation_completed': '작업이 성공적으로 완료되었습니다!',
-        'operation_failed': '작업 실패!',
-        'no_drivers_selected': '설치할 드라이버를 하나 이상 선택해 주세요',
-        'hardware_info': '감지된 그래픽 카드:',
-        'gpu_detected': 'GPU 감지됨:',
-        'no_gpu_detected': '호환되는 그래픽 카드가 감지되지 않음',
-        'need_root': '루트 권한 필요',
-        'need_root_msg': '이 작업에는 관리자 권한이 필요합니다. 비밀번호를 입력해 주세요.',
-        'install_success': '드라이버 설치 성공!',
-        'install_failed': '드라이버 설치 실패'
-    }
-}
-
 COLORS = {
     'primary': {
         'dark': '#0f0f23',
@@ -295,78 +55,138 @@ COLORS = {
     }
 }
 
-class LanguageManager:
-    def __init__(self):
-        self.current_language = self.detect_system_language()
-        self.load_language_setting()
+NVIDIA_BRANCH_PACKAGES = {
+    'open': [
+        'nvidia-open-dkms',
+        'nvidia-utils',
+        'nvidia-settings',
+        'vulkan-icd-loader',
+        'vulkan-tools'
+    ],
+    '580xx': [
+        'nvidia-580xx-dkms',
+        'nvidia-580xx-utils',
+        'nvidia-settings',
+        'lib32-nvidia-580xx-utils',
+        'vulkan-icd-loader',
+        'vulkan-tools'
+    ],
+    '470xx': [
+        'nvidia-470xx-dkms',
+        'nvidia-470xx-utils',
+        'nvidia-settings',
+        'lib32-nvidia-470xx-utils',
+        'vulkan-icd-loader',
+        'vulkan-tools'
+    ],
+    '390xx': [
+        'nvidia-390xx-dkms',
+        'nvidia-390xx-utils',
+        'lib32-nvidia-390xx-utils',
+        'nvidia-settings',
+        'vulkan-icd-loader',
+        'vulkan-tools'
+    ]
+}
 
-    def detect_system_language(self):
-        try:
-            lang_env = os.environ.get('LANG', '') or os.environ.get('LANGUAGE', '')
-            if lang_env:
-                lang_code = lang_env.split('_')[0].lower()
-                if lang_code in ['ru', 'uk']:
-                    return 'ru'
+# Разбираемый вывод (pacman, mkinitcpio) читается в одной фиксированной локали
+C_LOCALE_PREFIX = ["env", "LC_ALL=C"]
 
-            try:
-                system_locale = locale.getdefaultlocale()[0]
-                if system_locale:
-                    lang_code = system_locale.split('_')[0].lower()
-                    if lang_code in ['ru', 'uk']:
-                        return 'ru'
-            except:
-                pass
+GRUB_CONFIG_HELPER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'grub_config.py')
 
-        except Exception as e:
-            print(f"Language detection error: {e}")
+class DriverSignals(QObject):
+    output_received = pyqtSignal(str)
+    progress_updated = pyqtSignal(int, str)
+    installation_finished = pyqtSignal(bool, str)
 
-        return 'en'
+class SudoSignals(QObject):
+    # (успех, пароль, запущенный RootHelper или None)
+    validation_finished = pyqtSignal(bool, object, object)
 
-    def load_language_setting(self):
-        try:
-            config_dir = Path.home() / '.config' / 'enos_manager'
-            config_file = config_dir / 'settings.json'
-
-            if config_file.exists():
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                    saved_language = settings.get('language')
-                    if saved_language in LOCALES:
-                        self.current_language = saved_language
-        except Exception as e:
-            print(f"Error loading language settings: {e}")
+class DetectionSignals(QObject):
+    gpu_found = pyqtSignal(str, str, object)
+    detection_finished = pyqtSignal()
+    detection_failed = pyqtSignal(str)
 
-    def save_language_setting(self):
-        try:
-            config_dir = Path.home() / '.config' / 'enos_manager'
-            config_dir.mkdir(parents=True, exist_ok=True)
+class HardwareDetector:
+    def __init__(self, signals):
+        self.signals = signals
 
-            config_file = config_dir / 'settings.json'
-            settings = {'language': self.current_language}
+    def run(self):
+        try:
+            fingerprint = pci_fingerprint()
+            cached = load_cached_gpus(fingerprint)
+            if cached is not None:
+                for vendor, model, device in cached:
+                    self.signals.gpu_found.emit(vendor, model, device)
+                self.signals.detection_finished.emit()
+                return
 
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, ensure_ascii=False, indent=2)
+            gpus = []
+            for device in scan_display_devices():
+                vendor = GPU_VENDORS.get(device.vendor_id)
+                if vendor is None:
+                    continue
+                # pci.ids читается только для найденных видеокарт
+                model = lookup_pci_name(device.vendor_id, device.device_id)
+                gpus.append((vendor, model, device))
+                self.signals.gpu_found.emit(vendor, model, device)
+
+            save_cached_gpus(fingerprint, gpus)
+            self.signals.detection_finished.emit()
         except Exception as e:
-            print(f"Error saving language settings: {e}")
+            self.signals.detection_failed.emit(str(e))
 
-    def get_text(self, key):
-        return LOCALES[self.current_language].get(key, key)
+class SudoValidator:
+    """Получает root вне потока GUI: пароль проверяется самим запуском root_helper."""
 
-    def set_language(self, language):
-        if language in LOCALES:
-            self.current_language = language
-            self.save_language_setting()
-            return True
-        return False
+    def __init__(self, signals, password=None):
+        self.signals = signals
+        self.password = password
 
-class DriverSignals(QObject):
-    output_received = pyqtSignal(str)
-    progress_updated = pyqtSignal(int, str)
-    installation_finished = pyqtSignal(bool, str)
+    def run(self):
+        if self.password is None:
+            # Без пароля только проверяем кэш sudo или NOPASSWD
+            try:
+                result = subprocess.run(["sudo", "-n", "true"], stdin=subprocess.DEVNULL, capture_output=True, timeout=30)
+            except Exception as e:
+                print(f"Error checking sudo: {e}")
+                self.signals.validation_finished.emit(False, None, None)
+                return
+            if result.returncode != 0:
+                self.signals.validation_finished.emit(False, None, None)
+                return
+            self.signals.validation_finished.emit(True, "", self.start_root_helper(""))
+            return
+
+        # PAM проходится один раз — при запуске помощника, отдельного sudo -v нет
+        try:
+            root_helper = RootHelper.start(self.password)
+        except PermissionError:
+            self.signals.validation_finished.emit(False, self.password, None)
+            return
+        # Пароль принят, но помощник мог не запуститься (sudoers без python, долгий PAM) —
+        # тогда команды пойдут через sudo по отдельности с этим паролем
+        self.signals.validation_finished.emit(True, self.password, root_helper)
+
+    def start_root_helper(self, password):
+        try:
+            return RootHelper.start(password)
+        except PermissionError:
+            # Кэш sudo истёк между проверкой и запуском: каждая команда спросит sudo сама
+            return None
+
+MINIMAL_BUTTON_COLORS = {
+    'blue': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['blue']},
+    'purple': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['purple']},
+    'cyan': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['cyan']},
+    'green': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['green']}
+}
 
 class MinimalButton(QPushButton):
     def __init__(self, text, icon=None, color_scheme='blue', parent=None):
         super().__init__(text, parent)
+        self.pixmap_cache = ButtonPixmapCache(self)
         self.setCursor(Qt.PointingHandCursor)
         self.setMinimumHeight(50)
         self.setFont(QFont("Segoe UI", 11, QFont.Bold))
@@ -390,51 +210,54 @@ class MinimalButton(QPushButton):
         self.click_animation.setEasingCurve(QEasingCurve.OutCubic)
 
     def update_style(self):
-        colors = {
-            'blue': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['blue']},
-            'purple': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['purple']},
-            'cyan': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['cyan']},
-            'green': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['green']}
-        }
-
-        color = colors.get(self.color_scheme, colors['blue'])
-
-        self.setStyleSheet(f"""
-            MinimalButton {{
-                background-color: {color['bg']};
-                color: {color['text']};
-                border: 1px solid {COLORS['misc']['border']};
-                border-radius: 8px;
-                padding: 12px 18px;
-                text-align: center;
-                font-weight: bold;
-                font-size: 12px;
-            }}
-            MinimalButton:hover {{
-                background-color: {color['hover']};
-                border: 1px solid {color['text']};
-            }}
-            MinimalButton:pressed {{
-                background-color: {color['bg']};
-                border: 1px solid {color['text']};
-            }}
-            MinimalButton:checked {{
-                background-color: {color['text']};
-                color: {COLORS['primary']['dark']};
-                border: 1px solid {color['text']};
-            }}
-            MinimalButton:disabled {{
-                background-color: {COLORS['primary']['medium']};
-                color: {COLORS['text']['muted']};
-                border: 1px solid {COLORS['misc']['border']};
-            }}
-        """)
-
+        scheme = self.color_scheme if self.color_scheme in MINIMAL_BUTTON_COLORS else 'blue'
+        register_stylesheet(('MinimalButton', 'driver'), MinimalButton.build_stylesheet)
+        apply_button_style(self, 'driver', scheme)
+        self.pixmap_cache.clear()
+
+    @staticmethod
+    def build_stylesheet():
+        rules = []
+        for scheme, color in MINIMAL_BUTTON_COLORS.items():
+            selector = button_selector('driver', scheme)
+            rules.append(f"""
+                {selector} {{
+                    background-color: {color['bg']};
+                    color: {color['text']};
+                    border: 1px solid {COLORS['misc']['border']};
+                    border-radius: 8px;
+                    padding: 12px 18px;
+                    text-align: center;
+                    font-weight: bold;
+                    font-size: 12px;
+                }}
+                {selector}:hover {{
+                    background-color: {color['hover']};
+                    border: 1px solid {color['text']};
+                }}
+                {selector}:pressed {{
+                    background-color: {color['bg']};
+                    border: 1px solid {color['text']};
+                }}
+                {selector}:checked {{
+                    background-color: {color['text']};
+                    color: {COLORS['primary']['dark']};
+                    border: 1px solid {color['text']};
+                }}
+                {selector}:disabled {{
+                    background-color: {COLORS['primary']['medium']};
+                    color: {COLORS['text']['muted']};
+                    border: 1px solid {COLORS['misc']['border']};
+                }}
+            """)
+        return ''.join(rules)
 
     def get_opacity(self):
         return self._opacity
 
     def set_opacity(self, opacity):
+        if opacity == self._opacity:
+            return
         self._opacity = opacity
         self.update()
 
@@ -442,6 +265,8 @@ class MinimalButton(QPushButton):
         return self._scale
 
     def set_scale(self, scale):
+        if scale == self._scale:
+            return
         self._scale = scale
         self.update()
 
@@ -477,127 +302,241 @@ class MinimalButton(QPushButton):
         super().mouseReleaseEvent(event)
 
     def paintEvent(self, event):
+        # В покое кнопку рисует стиль как обычно
+        if self._scale == 1.0 and self._opacity == 1.0:
+            super().paintEvent(event)
+            return
+
+        # Кадр анимации — масштабированная копия изображения текущего состояния
         painter = QPainter(self)
         painter.setOpacity(self._opacity)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.translate(self.rect().center())
-        painter.scale(self._scale, self._scale)
-        painter.translate(-self.rect().center())
-        super().paintEvent(event)
-
-class OutputConsole(QTextEdit):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setReadOnly(True)
-        self.setFont(QFont("Monospace", 9))
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
 
-        self.setStyleSheet(f"""
-            OutputConsole {{
-                background-color: {COLORS['primary']['dark']};
-                color: {COLORS['text']['secondary']};
-                border: 1px solid {COLORS['misc']['border']};
-                border-radius: 8px;
-                padding: 10px;
-                font-family: 'Monospace';
-            }}
-        """)
+        center_x, center_y = self.width() / 2, self.height() / 2
+        painter.translate(center_x, center_y)
+        painter.scale(self._scale, self._scale)
+        painter.translate(-center_x, -center_y)
 
-    def append_output(self, text, color=None):
-        cursor = self.textCursor()
-        cursor.movePosition(QTextCursor.End)
+        painter.drawPixmap(0, 0, self.pixmap_cache.pixmap())
 
-        if color:
-            self.setTextColor(QColor(color))
-        else:
-            self.setTextColor(QColor(COLORS['text']['secondary']))
-
-        cursor.insertText(text + '\n')
-        self.setTextCursor(cursor)
-        self.ensureCursorVisible()
+    def changeEvent(self, event):
+        self.pixmap_cache.clear()
+        super().changeEvent(event)
 
 class DriverInstaller:
-    def __init__(self, signals, update_system=False, install_nomodeset=False, sudo_password=None, nvidia_model=None):
+    keyring_ready = False
+
+    def __init__(self, signals, update_system=False, install_nomodeset=False, sudo_password=None, nvidia_model=None,
+                 lock_timeout=30, nvidia_device_id=None, root_helper=None):
         self.signals = signals
         self.update_system = update_system
         self.install_nomodeset = install_nomodeset
         self.stop_requested = False
         self.sudo_password = sudo_password
+        # Общий процесс root_helper; без него каждая команда запускается через свой sudo
+        self.root_helper = root_helper
         self.nvidia_model = nvidia_model
+        self.nvidia_device_id = nvidia_device_id
+        self.lock_timeout = lock_timeout
+        self.progress = InstallProgress([], signals.progress_updated.emit)
 
-    def run_sudo_command(self, command, description=""):
+    def run_sudo_command(self, command, description="", idle_timeout=600, line_callback=None):
         try:
             if description:
                 self.signals.output_received.emit(f"🔧 {description}...")
 
-            full_command = ["sudo", "-S"] + command
-            input_text = (self.sudo_password + '\n') if self.sudo_password else '\n'
+            if line_callback is not None:
+                command = C_LOCALE_PREFIX + list(command)
 
-            result = subprocess.run(
-                full_command,
-                input=input_text,
-                capture_output=True,
-                text=True,
-                timeout=600
-            )
+            tail = deque(maxlen=20)
+
+            def on_line(line):
+                cleaned = line.rstrip()
+                if cleaned:
+                    tail.append(cleaned)
+                    if line_callback is None or not line_callback(cleaned):
+                        self.signals.output_received.emit(cleaned)
+
+            if self.root_helper is not None and self.root_helper.is_alive():
+                return_code = self.root_helper.run(command, on_line, idle_timeout)
+            else:
+                return_code = self._run_with_sudo(command, on_line, idle_timeout)
 
-            if result.returncode == 0:
+            if return_code == 0:
                 if description:
                     self.signals.output_received.emit(f"✔️ {description} completed")
                 return True
             else:
-                stderr = result.stderr.strip()
-                self.signals.output_received.emit(f"❌ {description} failed: {stderr}")
+                last_line = tail[-1] if tail else ""
+                self.signals.output_received.emit(
+                    f"❌ {description} failed (exit code {return_code}): {last_line}"
+                )
                 return False
 
         except subprocess.TimeoutExpired:
-            self.signals.output_received.emit(f"❌ {description} timed out")
+            self.signals.output_received.emit(f"❌ {description} timed out (no output for {idle_timeout}s)")
             return False
         except Exception as e:
             self.signals.output_received.emit(f"❌ {description} error: {str(e)}")
             return False
 
+    def _run_with_sudo(self, command, on_line, idle_timeout):
+        full_command = ["sudo", "-S", "-p", ""] + command
+        input_text = (self.sudo_password + '\n') if self.sudo_password else '\n'
+
+        process = subprocess.Popen(
+            full_command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors='replace',
+            bufsize=1,
+            start_new_session=True
+        )
+
+        try:
+            process.stdin.write(input_text)
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+
+        # Таймаут считается от последней строки вывода, а не от старта команды:
+        # долгий pacman -Syu не прерывается, пока он что-то пишет.
+        last_activity = [time.monotonic()]
+        timed_out = threading.Event()
+        watchdog = threading.Thread(
+            target=self._watch_idle_process,
+            args=(process, idle_timeout, last_activity, timed_out),
+            daemon=True
+        )
+        watchdog.start()
+
+        for line in iter(process.stdout.readline, ''):
+            last_activity[0] = time.monotonic()
+            on_line(line)
+
+        process.stdout.close()
+        return_code = process.wait()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(full_command, idle_timeout)
+        return return_code
+
+    def _watch_idle_process(self, process, idle_timeout, last_activity, timed_out):
+        while True:
+            remaining = idle_timeout - (time.monotonic() - last_activity[0])
+            if remaining <= 0:
+                timed_out.set()
+                self._terminate_process_group(process)
+                return
+            try:
+                process.wait(timeout=remaining)
+                return
+            except subprocess.TimeoutExpired:
+                continue
+
+    def _terminate_process_group(self, process):
+        # sudo пересылает SIGTERM запущенной команде, SIGKILL — только если она не завершилась
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except OSError:
+                process.kill()
+        except OSError:
+            process.kill()
+
     def wait_for_pacman_lock(self):
-        lock_file = "/var/lib/pacman/db.lck"
-        max_wait = 30
-        wait_time = 0
+        if not os.path.exists(PACMAN_LOCK):
+            return True
 
-        while os.path.exists(lock_file) and wait_time < max_wait:
-            self.signals.output_received.emit("⏳ Waiting for pacman database to unlock...")
-            time.sleep(2)
-            wait_time += 2
+        self.signals.output_received.emit("⏳ Waiting for pacman database to unlock...")
+        if wait_for_lock_release(self.lock_timeout):
+            self.signals.output_received.emit("🔓 Pacman database unlocked")
+            return True
+
+        holders = pacman_lock_holders()
+        known = {pid for pid, _ in holders}
+        for pid in self.lock_file_users():
+            if pid not in known:
+                holders.append((pid, process_name(pid) or "unknown"))
+
+        if holders:
+            running = ", ".join(f"{name} (PID {pid})" for pid, name in holders)
+            self.signals.output_received.emit(f"❌ Pacman database is in use by: {running}")
+            return False
+
+        # Блокировку оставил упавший процесс — удалять её безопасно
+        return self.run_sudo_command(["rm", "-f", PACMAN_LOCK], "Remove stale database lock")
 
-        if os.path.exists(lock_file):
-            self.run_sudo_command(["rm", "-f", lock_file], "Remove database lock")
+    def lock_file_users(self):
+        """PID процессов, у которых открыт db.lck; дескрипторы root-процессов видны только от root."""
+        if shutil.which("fuser") is None:
+            self.signals.output_received.emit("⚠️ fuser not found, only pacman processes are checked")
+            return []
+
+        lines = []
+        try:
+            if self.root_helper is not None and self.root_helper.is_alive():
+                return_code = self.root_helper.run(["fuser", PACMAN_LOCK], lines.append, 30)
+            else:
+                return_code = self._run_with_sudo(["fuser", PACMAN_LOCK], lines.append, 30)
+        except Exception as e:
+            self.signals.output_received.emit(f"⚠️ Cannot check who holds {PACMAN_LOCK}: {e}")
+            return []
+
+        # fuser завершается с кодом 1, если файл никем не открыт
+        if return_code != 0:
+            return []
+        return parse_fuser_pids(lines)
 
     def install_drivers(self, driver_types):
         try:
-            self.wait_for_pacman_lock()
+            total_drivers = len(driver_types)
+            planned_drivers, packages = self.plan_installation(driver_types)
+            packages = self.skip_installed_packages(packages)
+
+            if not packages and not self.update_system and not self.install_nomodeset:
+                if planned_drivers:
+                    self.signals.progress_updated.emit(100, "✅ Nothing to do")
+                    self.signals.installation_finished.emit(True, "All selected driver packages are already installed")
+                else:
+                    self.signals.installation_finished.emit(False, "No driver packages to install")
+                return
+
+            self.progress = InstallProgress(self.plan_progress_phases(packages), self.signals.progress_updated.emit)
+
+            if not self.wait_for_pacman_lock():
+                self.signals.installation_finished.emit(False, "Pacman database is locked by another process")
+                return
 
             if self.update_system:
-                self.signals.progress_updated.emit(10, "🟢 Updating system...")
-                if not self.run_sudo_command(["pacman", "-Syu", "--noconfirm"], "Update system"):
+                self.progress.start_phase('update', "🟢 Updating system...")
+                if not self.run_sudo_command(["pacman", "-Syu", "--noconfirm"], "Update system",
+                                             line_callback=self.progress.feed):
                     self.signals.installation_finished.emit(False, "System update failed")
                     return
+                self.progress.finish_phase()
 
             installed_count = 0
-            total_drivers = len(driver_types)
-
-            for i, driver_type in enumerate(driver_types):
-                progress = 20 + (i * 60 // total_drivers)
-                self.signals.progress_updated.emit(progress, f"📦 Installing {driver_type} drivers...")
-
-                if self.install_driver_packages(driver_type):
-                    installed_count += 1
+            if packages:
+                self.signals.output_received.emit(f"📦 Installing {', '.join(planned_drivers)} drivers...")
+                if self.install_driver_packages(packages):
+                    installed_count = len(planned_drivers)
                 else:
-                    self.signals.output_received.emit(f"⚠️ Skipping {driver_type} due to installation failure")
+                    self.signals.installation_finished.emit(False, "Driver package installation failed")
+                    return
 
             if installed_count > 0:
-                self.signals.progress_updated.emit(85, "🟢 Updating initramfs...")
-                self.run_sudo_command(["mkinitcpio", "-P"], "Update initramfs")
+                self.update_initramfs(packages)
 
-                if self.install_nomodeset:
-                    self.signals.progress_updated.emit(90, "🛠️ Configuring GRUB...")
-                    self.configure_grub()
+            if self.install_nomodeset:
+                self.progress.start_phase('grub', "🛠️ Configuring GRUB...")
+                self.configure_grub()
+                self.progress.finish_phase()
 
             self.signals.progress_updated.emit(100, "🛠️ Installation completed!")
             success_msg = f"Successfully installed {installed_count}/{total_drivers} driver packages"
@@ -607,75 +546,94 @@ class DriverInstaller:
             self.signals.output_received.emit(f"❌ Installation error: {str(e)}")
             self.signals.installation_finished.emit(False, f"Installation failed: {str(e)}")
 
+    def update_initramfs(self, packages):
+        if not initramfs_affecting_packages(packages):
+            self.signals.output_received.emit("ℹ️ Installed packages do not affect the initramfs, skipping mkinitcpio")
+            return True
+
+        all_presets = list_mkinitcpio_presets()
+        if not all_presets:
+            self.progress.start_phase('initramfs', "🟢 Updating initramfs...")
+            success = self.run_sudo_command(["mkinitcpio", "-P"], "Update initramfs",
+                                            line_callback=self.progress.feed)
+            self.progress.finish_phase()
+            return success
+
+        presets = presets_for_dkms(all_presets, read_local_packages())
+        # Хук mkinitcpio в pacman срабатывает на dkms.conf и мог уже всё пересобрать
+        presets = [preset for preset in presets if preset not in self.progress.built_presets]
+        if not presets:
+            self.signals.output_received.emit("ℹ️ Initramfs was already regenerated by pacman hooks")
+            return True
+
+        self.progress.start_phase('initramfs', "🟢 Updating initramfs...")
+        self.progress.expected_presets = len(presets)
+        results = {}
+
+        def build(preset):
+            results[preset] = self.run_sudo_command(
+                ["mkinitcpio", "-p", preset], f"Update initramfs ({preset})",
+                line_callback=self.progress.feed
+            )
 
-    def install_driver_packages(self, driver_type):
+        threads = [threading.Thread(target=build, args=(preset,), daemon=True) for preset in presets[1:]]
+        for thread in threads:
+            thread.start()
+        build(presets[0])
+        for thread in threads:
+            thread.join()
+
+        self.progress.finish_phase()
+        return all(results.values())
+
+    def plan_progress_phases(self, packages):
+        # Веса примерно соответствуют типичной длительности этапов
+        phases = []
+        if self.update_system:
+            phases.append(('update', 35))
+        if packages:
+            phases += [('download', 30), ('install', 20), ('initramfs', 10)]
+        if self.install_nomodeset:
+            phases.append(('grub', 5))
+        return phases
+
+    def skip_installed_packages(self, packages):
+        if not packages:
+            return packages
+
+        installed = read_local_packages()
+        available = read_sync_versions([p for p in packages if p in installed])
+        to_install, satisfied = filter_installed(packages, installed, available)
+
+        if satisfied:
+            self.signals.output_received.emit(f"ℹ️ Already installed, skipping: {', '.join(satisfied)}")
+        return to_install
+
+
+    def resolve_driver_packages(self, driver_type):
         repo_packages = []
 
         if driver_type == 'nvidia':
-            if self.nvidia_model is None:
+            if self.nvidia_model is None and self.nvidia_device_id is None:
                 self.signals.output_received.emit("⚠️ No NVIDIA model detected")
-                return False
-
-            match = re.search(r'(RTX|GTX|GT)\s*(\d+)', self.nvidia_model, re.I)
-            if match:
-                prefix = match.group(1).upper()
-                series_num = int(match.group(2))
-
-                if prefix == 'RTX' or series_num >= 1650:
-                    repo_packages = [
-                        'nvidia-open-dkms',
-                        'nvidia-utils',
-                        'nvidia-settings',
-                        'vulkan-icd-loader',
-                        'vulkan-tools'
-                    ]
-
-                elif series_num >= 900:
-                    repo_packages = [
-                        'nvidia-580xx-dkms',
-                        'nvidia-580xx-utils',
-                        'nvidia-settings',
-                        'lib32-nvidia-580xx-utils',
-                        'vulkan-icd-loader',
-                        'vulkan-tools'
-                    ]
-
-                elif series_num >= 600:
-                    repo_packages = [
-                        'nvidia-470xx-dkms',
-                        'nvidia-470xx-utils',
-                        'nvidia-settings',
-                        'lib32-nvidia-470xx-utils',
-                        'vulkan-icd-loader',
-                        'vulkan-tools'
-                    ]
-
-                elif series_num >= 400:
-                    repo_packages = [
-                        'nvidia-390xx-dkms',
-                        'nvidia-390xx-utils',
-                        'lib32-nvidia-390xx-utils',
-                        'nvidia-settings',
-                        'vulkan-icd-loader',
-                        'vulkan-tools'
-                    ]
-
-                else:
-                    self.signals.output_received.emit(
-                        "❌ Ваша видеокарта слишком старая (до Fermi).\n"
-                        "Проприетарные драйверы NVIDIA больше не поддерживаются.\n"
-                        "Рекомендуется использовать открытый драйвер nouveau."
-                    )
-                    return False
+                return []
+
+            # Сначала точный поиск по PCI ID, имя модели — только запасной вариант
+            branch = nvidia_branch_for_device(self.nvidia_device_id)
+            if branch is None:
+                branch = self.guess_nvidia_branch(self.nvidia_model or "")
+
+            if branch == 'legacy':
+                self.signals.output_received.emit(
+                    "❌ Ваша видеокарта слишком старая (до Fermi).\n"
+                    "Проприетарные драйверы NVIDIA больше не поддерживаются.\n"
+                    "Рекомендуется использовать открытый драйвер nouveau."
+                )
+                return []
 
-            else:
-                repo_packages = [
-                    'nvidia-open-dkms',
-                    'nvidia-utils',
-                    'nvidia-settings',
-                    'vulkan-icd-loader',
-                    'vulkan-tools'
-                ]
+            repo_packages = list(NVIDIA_BRANCH_PACKAGES.get(branch, []))
+            if repo_packages:
+                self.signals.output_received.emit(f"ℹ️ NVIDIA driver branch: {branch}")
 
         elif driver_type == 'amd':
             repo_packages = [
@@ -694,75 +652,131 @@ class DriverInstaller:
 
         if not repo_packages:
             self.signals.output_received.emit(f"⚠️ Unknown driver type or GPU: {driver_type}")
-            return False
+            return []
+
+        return repo_packages
+
+    def guess_nvidia_branch(self, model):
+        match = re.search(r'(RTX|GTX|GT)\s*(\d+)', model, re.I)
+        if not match:
+            return 'open'
+
+        prefix = match.group(1).upper()
+        series_num = int(match.group(2))
+
+        if prefix == 'RTX' or series_num >= 1650:
+            return 'open'
+        elif series_num >= 900:
+            return '580xx'
+        elif series_num >= 600:
+            return '470xx'
+        elif series_num >= 400:
+            return '390xx'
+        return 'legacy'
+
+    def plan_installation(self, driver_types):
+        # Один общий набор пакетов: mesa/lib32-mesa для Intel+AMD/NVIDIA не дублируются
+        planned_drivers = []
+        packages = []
+        seen = set()
+
+        for driver_type in driver_types:
+            repo_packages = self.resolve_driver_packages(driver_type)
+            if not repo_packages:
+                self.signals.output_received.emit(f"⚠️ Skipping {driver_type}: no packages selected")
+                continue
+
+            planned_drivers.append(driver_type)
+            for package in repo_packages:
+                if package not in seen:
+                    seen.add(package)
+                    packages.append(package)
+
+        if packages:
+            self.signals.output_received.emit(
+                f"📦 Selected packages for {', '.join(planned_drivers)}: {', '.join(packages)}"
+            )
+        return planned_drivers, packages
 
-        all_packages = repo_packages
-        self.signals.output_received.emit(
-            f"📦 Selected packages for {driver_type}: {', '.join(all_packages)}"
-        )
+    def install_driver_packages(self, packages):
+        # pacman -Sw тоже проверяет подписи, поэтому связка ключей готовится до скачивания
+        self.init_keyring()
 
-        self.run_sudo_command(["pacman-key", "--init"], "Init pacman key")
-        self.run_sudo_command(["pacman-key", "--populate", "archlinux"], "Populate pacman key")
+        if not self.download_packages(packages):
+            self.signals.output_received.emit("❌ Failed to download packages, nothing was installed")
+            return False
 
-        self.signals.output_received.emit("📦 Installing packages from repositories...")
+        self.progress.start_phase('install', "📦 Installing packages from repositories...")
         if not self.run_sudo_command(
-            ["pacman", "-S", "--noconfirm"] + all_packages,
-            "Install NVIDIA driver packages"
+            ["pacman", "-S", "--needed", "--noconfirm"] + packages,
+            "Install driver packages",
+            line_callback=self.progress.feed
         ):
             self.signals.output_received.emit("❌ Failed to install some packages")
             return False
+        self.progress.finish_phase()
 
         self.signals.output_received.emit("✅ Driver installation completed successfully")
         return True
 
+    def init_keyring(self):
+        # Проверка один раз за сессию: повторные установки не трогают связку ключей
+        if DriverInstaller.keyring_ready:
+            return
+
+        state = keyring_state()
+        if state is None:
+            self.signals.output_received.emit("ℹ️ Pacman keyring is up to date, skipping pacman-key")
+            DriverInstaller.keyring_ready = True
+            return
 
+        if state == 'init' and not self.run_sudo_command(["pacman-key", "--init"], "Init pacman key"):
+            return
+        if self.run_sudo_command(["pacman-key", "--populate", "archlinux"], "Populate pacman key"):
+            DriverInstaller.keyring_ready = True
+
+    def download_packages(self, packages):
+        self.progress.start_phase('download', "⬇️ Downloading packages...")
+        if not self.run_sudo_command(
+            ["pacman", "-Sw", "--needed", "--noconfirm"] + packages,
+            "Download driver packages",
+            line_callback=self.progress.feed
+        ):
+            return False
+        self.progress.finish_phase()
+        return True
 
     def configure_grub(self):
         self.signals.output_received.emit("🛠️ Configuring GRUB...")
 
-        self.run_sudo_command(
-            ["cp", "/etc/default/grub", "/etc/default/grub.backup"],
-            "Backup GRUB config"
-        )
+        result = {}
 
-        try:
-            with open("/etc/default/grub", "r") as f:
-                grub_content = f.read()
-        except Exception as e:
-            self.signals.output_received.emit(f"❌ Cannot read /etc/default/grub: {e}")
+        def capture(line):
+            for marker in (grub_config.RESULT_CHANGED, grub_config.RESULT_UNCHANGED):
+                if line.startswith(marker):
+                    result['changed'] = marker == grub_config.RESULT_CHANGED
             return False
 
-        cmdline_match = re.search(r'^GRUB_CMDLINE_LINUX_DEFAULT="([^"]*)"', grub_content, re.MULTILINE)
+        # Резервная копия, правка и атомарная замена файла — одним вызовом от root
+        success = self.run_sudo_command(
+            [sys.executable, GRUB_CONFIG_HELPER, "--add", "nomodeset"],
+            "Add nomodeset to GRUB_CMDLINE_LINUX_DEFAULT",
+            line_callback=capture
+        )
 
-        if not cmdline_match:
-            self.signals.output_received.emit("❌ Не найдена строка GRUB_CMDLINE_LINUX_DEFAULT")
+        if not success or 'changed' not in result:
+            self.signals.output_received.emit("❌ Не удалось добавить nomodeset в GRUB")
             return False
 
-        current_params = cmdline_match.group(1).strip()
-        params_list = current_params.split()
-
-        if "nomodeset" in params_list:
+        if not result['changed']:
             self.signals.output_received.emit("ℹ️ Параметр nomodeset уже присутствует в GRUB")
             return True
 
-        params_list.insert(0, "nomodeset")
-        new_cmdline = ' '.join(params_list)
-
-        sed_pattern = f's/GRUB_CMDLINE_LINUX_DEFAULT="[^"]*"/GRUB_CMDLINE_LINUX_DEFAULT="{new_cmdline}"/'
-
-        result = self.run_sudo_command(
-            ["sed", "-i", sed_pattern, "/etc/default/grub"],
-            "Add nomodeset to GRUB_CMDLINE_LINUX_DEFAULT"
-        )
-
-        if not result:
-            self.signals.output_received.emit("❌ Не удалось добавить nomodeset в GRUB")
-            return False
-
-        self.run_sudo_command(
+        if not self.run_sudo_command(
             ["grub-mkconfig", "-o", "/boot/grub/grub.cfg"],
             "Update GRUB configuration"
-        )
+        ):
+            return False
 
         self.signals.output_received.emit("✅ nomodeset успешно добавлен в параметры загрузки")
         return True
@@ -770,7 +784,8 @@ class DriverInstaller:
 class DriverManager(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.language_manager = LanguageManager()
+        self.language_manager = LanguageManager('driver-manager')
+        self.language_manager.language_changed.connect(self.on_language_switched)
 
         self.setWindowTitle(self.language_manager.get_text('app_title'))
         self.setFixedSize(800, 800)
@@ -781,9 +796,21 @@ class DriverManager(QMainWindow):
             pass
 
         self.install_thread = None
+        self.sudo_thread = None
+        self.sudo_signals = SudoSignals()
+        self.sudo_password = None
+        self.sudo_tries = 0
+        self.pending_drivers = []
+        self.root_helper = None
+        self.detection_thread = None
         self.detected_gpus = []
+        self.gpu_devices = []
+        self.gpu_descriptions = []
+        self.detection_done = False
         self.signals = DriverSignals()
+        self.detection_signals = DetectionSignals()
         self.nvidia_model = None
+        self.nvidia_device_id = None
 
         self.setup_ui()
         self.connect_signals()
@@ -992,7 +1019,8 @@ class DriverManager(QMainWindow):
         console_label.setStyleSheet(f"color: {COLORS['text']['primary']}; font-weight: bold; font-size: 13px;")
         parent_layout.addWidget(console_label)
 
-        self.console = OutputConsole()
+        self.console = OutputConsole(COLORS, log_name='driver-manager')
+        self.console.load_older_text = self.language_manager.get_text('load_older')
         self.console.setMinimumHeight(150)
         parent_layout.addWidget(self.console)
 
@@ -1038,17 +1066,28 @@ class DriverManager(QMainWindow):
         self.signals.output_received.connect(self.on_output_received)
         self.signals.progress_updated.connect(self.on_progress_updated)
         self.signals.installation_finished.connect(self.on_installation_finished)
+        self.detection_signals.gpu_found.connect(self.on_gpu_found)
+        self.detection_signals.detection_finished.connect(self.on_detection_finished)
+        self.detection_signals.detection_failed.connect(self.on_detection_failed)
+        self.sudo_signals.validation_finished.connect(self.on_sudo_validated)
 
     def on_language_changed(self):
         language_code = self.language_combo.currentData()
-        if self.language_manager.set_language(language_code):
-            self.retranslate_ui()
+        # Тексты обновит on_language_switched по сигналу language_changed
+        self.language_manager.set_language(language_code)
+
+    def on_language_switched(self, language):
+        # Язык могли сменить и в другом окне: комбобокс догоняет его без повторного сигнала
+        self.language_combo.blockSignals(True)
+        self.language_combo.setCurrentIndex(self.language_combo.findData(language))
+        self.language_combo.blockSignals(False)
+        self.retranslate_ui()
 
     def retranslate_ui(self):
         self.setWindowTitle(self.language_manager.get_text('app_title'))
         self.header_label.setText(self.language_manager.get_text('header'))
 
-        self.hardware_info.setText(self.language_manager.get_text('detecting_hardware'))
+        self.update_hardware_info()
 
         self.nvidia_btn.setText(self.language_manager.get_text('install_nvidia'))
         self.amd_btn.setText(self.language_manager.get_text('install_amd'))
@@ -1056,17 +1095,14 @@ class DriverManager(QMainWindow):
 
         self.install_btn.setText(self.language_manager.get_text('install_btn'))
         self.clear_btn.setText(self.language_manager.get_text('clear_btn'))
+        self.console.load_older_text = self.language_manager.get_text('load_older')
 
         self.update_checkbox.setText(self.language_manager.get_text('system_update'))
         self.nomodeset_checkbox.setText(self.language_manager.get_text('nomodeset'))
 
     def load_fonts(self):
         try:
-            font_id = QFontDatabase.addApplicationFont("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
-            if font_id != -1:
-                font_family = QFontDatabase.applicationFontFamilies(font_id)[0]
-                app_font = QFont(font_family, 9)
-                QApplication.setFont(app_font)
+            load_app_font()
         except:
             pass
 
@@ -1097,61 +1133,72 @@ class DriverManager(QMainWindow):
         """)
 
     def detect_hardware(self):
-        try:
-            hardware_info = f"🔍 {self.language_manager.get_text('hardware_info')}\n\n"
-            self.detected_gpus = []
-
-            result = subprocess.run(["lspci", "-nn"], capture_output=True, text=True, timeout=10)
-            output = result.stdout
-
-            nvidia_ids = ['10de']
-            amd_ids = ['1002', '1022']
-            intel_ids = ['8086']
-
-            self.nvidia_btn.setEnabled(False)
-            self.amd_btn.setEnabled(False)
-            self.intel_btn.setEnabled(False)
-
-            for line in output.split('\n'):
-                if any(x in line for x in ['VGA', '3D', 'Display']):
-                    device_ids = re.findall(r'\[([0-9a-f]{4}:[0-9a-f]{4})\]', line)
-                    for device_id in device_ids:
-                        vendor_id = device_id.split(':')[0]
-                        model = re.sub(r'.*\[.*\]:\s*', '', line).strip()
-
-                        if vendor_id in nvidia_ids:
-                            hardware_info += f"• {self.language_manager.get_text('gpu_detected')} NVIDIA: {model}\n"
-                            if 'nvidia' not in self.detected_gpus:
-                                self.detected_gpus.append('nvidia')
-                            self.nvidia_model = model
-                            self.nvidia_btn.setEnabled(True)
-                        elif vendor_id in amd_ids:
-                            hardware_info += f"• {self.language_manager.get_text('gpu_detected')} AMD: {model}\n"
-                            if 'amd' not in self.detected_gpus:
-                                self.detected_gpus.append('amd')
-                            self.amd_btn.setEnabled(True)
-                        elif vendor_id in intel_ids:
-                            hardware_info += f"• {self.language_manager.get_text('gpu_detected')} Intel: {model}\n"
-                            if 'intel' not in self.detected_gpus:
-                                self.detected_gpus.append('intel')
-                            self.intel_btn.setEnabled(True)
-
-            if not self.detected_gpus:
-                hardware_info += f"• {self.language_manager.get_text('no_gpu_detected')}\n"
-
-            self.hardware_info.setText(hardware_info)
-            # enable install button if any gpu detected
-            self.install_btn.setEnabled(len(self.detected_gpus) > 0)
-
-            # Log detected GPUs to console for visibility
-            if self.detected_gpus:
-                self.console.append_output("🔍 Detected: " + ", ".join([d.upper() for d in self.detected_gpus]))
-            else:
-                self.console.append_output("🔍 No compatible GPUs detected")
+        # Окно показывается сразу, кнопки включаются по мере нахождения видеокарт
+        self.detected_gpus = []
+        self.gpu_devices = []
+        self.gpu_descriptions = []
+        self.detection_done = False
 
-        except Exception as e:
-            self.hardware_info.setText(f"❌ Hardware detection error: {str(e)}")
-            self.console.append_output(f"❌ Hardware detection error: {str(e)}")
+        self.nvidia_btn.setEnabled(False)
+        self.amd_btn.setEnabled(False)
+        self.intel_btn.setEnabled(False)
+        self.update_hardware_info()
+
+        detector = HardwareDetector(self.detection_signals)
+        self.detection_thread = threading.Thread(target=detector.run)
+        self.detection_thread.daemon = True
+        self.detection_thread.start()
+
+    def on_gpu_found(self, vendor, model, device):
+        label, button = {
+            'nvidia': ('NVIDIA', self.nvidia_btn),
+            'amd': ('AMD', self.amd_btn),
+            'intel': ('Intel', self.intel_btn),
+        }[vendor]
+
+        self.gpu_devices.append(device)
+        self.gpu_descriptions.append((label, model))
+        if vendor not in self.detected_gpus:
+            self.detected_gpus.append(vendor)
+        if vendor == 'nvidia':
+            self.nvidia_model = model
+            self.nvidia_device_id = device.device_id
+
+        button.setEnabled(True)
+        # enable install button if any gpu detected
+        self.install_btn.setEnabled(True)
+        self.update_hardware_info()
+
+    def on_detection_finished(self):
+        self.detection_done = True
+        self.update_hardware_info()
+
+        # Log detected GPUs to console for visibility
+        if self.detected_gpus:
+            self.console.append_output("🔍 Detected: " + ", ".join([d.upper() for d in self.detected_gpus]))
+        else:
+            self.console.append_output("🔍 No compatible GPUs detected")
+
+    def on_detection_failed(self, error):
+        self.detection_done = True
+        self.hardware_info.setText(f"❌ Hardware detection error: {error}")
+        self.console.append_output(f"❌ Hardware detection error: {error}")
+
+    def update_hardware_info(self):
+        if not self.gpu_descriptions and not self.detection_done:
+            self.hardware_info.setText(self.language_manager.get_text('detecting_hardware'))
+            return
+
+        hardware_info = f"🔍 {self.language_manager.get_text('hardware_info')}\n\n"
+        for label, model in self.gpu_descriptions:
+            hardware_info += f"• {self.language_manager.get_text('gpu_detected')} {label}: {model}\n"
+
+        if not self.gpu_descriptions:
+            hardware_info += f"• {self.language_manager.get_text('no_gpu_detected')}\n"
+        elif not self.detection_done:
+            hardware_info += f"\n{self.language_manager.get_text('detecting_hardware')}\n"
+
+        self.hardware_info.setText(hardware_info)
 
     def get_selected_drivers(self):
         selected_drivers = []
@@ -1167,57 +1214,63 @@ class DriverManager(QMainWindow):
 
         return selected_drivers
 
-    def check_sudo_access(self):
-        try:
-            result = subprocess.run(
-                ["sudo", "-n", "true"],
-                capture_output=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except:
-            return False
+    def request_sudo_access(self, password=None):
+        # Проверка идёт в отдельном потоке, окно в это время показывает индикатор ожидания
+        self.set_sudo_checking(True)
+        validator = SudoValidator(self.sudo_signals, password)
+        self.sudo_thread = threading.Thread(target=validator.run)
+        self.sudo_thread.daemon = True
+        self.sudo_thread.start()
+
+    def set_sudo_checking(self, checking):
+        self.install_btn.setEnabled(not checking)
+        if checking:
+            self.progress_bar.setRange(0, 0)
+            self.progress_bar.setFormat(self.language_manager.get_text('checking_root'))
+            self.progress_bar.setVisible(True)
+        else:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setFormat("%p%")
+            self.progress_bar.setVisible(False)
 
-    def request_sudo_access(self):
-        if self.check_sudo_access():
-            self.console.append_output("🔒 Root access already available (cached/NOPASSWD).")
-            return ""
+    def on_sudo_validated(self, success, password, root_helper):
+        self.set_sudo_checking(False)
 
-        self.console.append_output("🔐 Requesting root access (password required)...")
-        tries = 0
-        while tries < 3:
-            tries += 1
-            password, ok = QInputDialog.getText(
-                self,
-                self.language_manager.get_text('need_root'),
-                self.language_manager.get_text('need_root_msg'),
-                QtWidgets.QLineEdit.Password
-            )
-            if not ok:
-                self.console.append_output("❌ Root access canceled by user.")
-                return None
+        if success:
+            if password:
+                self.console.append_output("✅ Root access granted.")
+            else:
+                self.console.append_output("🔒 Root access already available (cached/NOPASSWD).")
+            self.sudo_password = password
+            self.root_helper = root_helper
+            if root_helper is None:
+                self.console.append_output("⚠️ Root helper unavailable, falling back to sudo for each command.")
+            self.confirm_installation()
+            return
 
-            # try to validate password with sudo -S -v
-            try:
-                proc = subprocess.run(
-                    ["sudo", "-S", "-k", "-v"],
-                    input=(password + "\n"),
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                if proc.returncode == 0:
-                    self.console.append_output("✅ Root access granted.")
-                    return password
-                else:
-                    stderr = proc.stderr.strip()
-                    self.console.append_output(f"❌ Incorrect password or sudo failed (attempt {tries}/3).")
-            except Exception as e:
-                self.console.append_output(f"❌ Error checking sudo: {e}")
-                return None
+        if password is not None:
+            self.console.append_output(f"❌ Incorrect password or sudo failed (attempt {self.sudo_tries}/3).")
+        else:
+            self.console.append_output("🔐 Requesting root access (password required)...")
+
+        if self.sudo_tries >= 3:
+            self.console.append_output("❌ Root access not granted after 3 attempts.")
+            self.show_error_message("Root access denied or canceled")
+            return
 
-        self.console.append_output("❌ Root access not granted after 3 attempts.")
-        return None
+        self.sudo_tries += 1
+        password, ok = QInputDialog.getText(
+            self,
+            self.language_manager.get_text('need_root'),
+            self.language_manager.get_text('need_root_msg'),
+            QtWidgets.QLineEdit.Password
+        )
+        if not ok:
+            self.console.append_output("❌ Root access canceled by user.")
+            self.show_error_message("Root access denied or canceled")
+            return
+
+        self.request_sudo_access(password)
 
     def start_installation(self):
         selected_drivers = self.get_selected_drivers()
@@ -1227,12 +1280,19 @@ class DriverManager(QMainWindow):
             return
 
         self.console.append_output("🟢 Selected drivers: " + ", ".join([d.upper() for d in selected_drivers]))
+        self.pending_drivers = selected_drivers
 
-        sudo_password = self.request_sudo_access()
-        if sudo_password is None:
-            self.show_error_message("Root access denied or canceled")
+        if self.root_helper is not None and self.root_helper.is_alive():
+            # Помощник уже работает от root — пароль больше не нужен
+            self.confirm_installation()
             return
 
+        self.sudo_tries = 0
+        self.request_sudo_access()
+
+    def confirm_installation(self):
+        selected_drivers = self.pending_drivers
+
         driver_list = ", ".join(selected_drivers).upper()
         reply = QMessageBox.question(
             self,
@@ -1253,7 +1313,8 @@ class DriverManager(QMainWindow):
         update_system = self.update_checkbox.isChecked()
         install_nomodeset = self.nomodeset_checkbox.isChecked()
 
-        installer = DriverInstaller(self.signals, update_system, install_nomodeset, sudo_password, self.nvidia_model)
+        installer = DriverInstaller(self.signals, update_system, install_nomodeset, self.sudo_password, self.nvidia_model,
+                                    nvidia_device_id=self.nvidia_device_id, root_helper=self.root_helper)
         self.install_thread = threading.Thread(target=lambda: installer.install_drivers(selected_drivers))
         self.install_thread.daemon = True
         self.install_thread.start()
@@ -1263,7 +1324,8 @@ class DriverManager(QMainWindow):
 
     def on_progress_updated(self, value, message):
         self.progress_bar.setValue(value)
-        self.console.append_output(message)
+        if message:
+            self.console.append_output(message)
 
     def on_installation_finished(self, success, message):
         self.progress_bar.setValue(100)
@@ -1291,8 +1353,24 @@ class DriverManager(QMainWindow):
             if reply == QMessageBox.No:
                 event.ignore()
                 return
+        self.release_root_helper()
         event.accept()
 
+    def release_root_helper(self):
+        root_helper, self.root_helper = self.root_helper, None
+        if root_helper is None:
+            return
+        install_thread = self.install_thread
+
+        def close():
+            # Внутри Start Manager установка продолжается и после закрытия окна: помощник
+            # нужен ей до конца, а close() ждёт его выхода — поэтому не в потоке GUI
+            if install_thread is not None:
+                install_thread.join()
+            root_helper.close()
+
+        threading.Thread(target=close, daemon=True).start()
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setApplicationName("EN-OS Driver Manager")
@@ -6,245 +6,19 @@ import threading
 import re
 import shutil
 import time
-import json
-import locale
-from pathlib import Path
 from PyQt5 import QtWidgets, QtGui
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QPushButton, QLabel, QFrame,
                              QLineEdit, QTextEdit, QProgressBar, QMessageBox, QComboBox)
 from PyQt5.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve, pyqtProperty, pyqtSignal, QObject
 from PyQt5.QtGui import (QIcon, QFont, QPalette, QColor, QLinearGradient,
-                         QPainter, QFontDatabase, QTextCursor)
+                         QPainter)
 
-os.environ['XDG_RUNTIME_DIR'] = '/tmp/runtime-root'
+from localization import LanguageManager
+from output_console import OutputConsole
+from styles import button_selector, register_stylesheet, apply_button_style, ButtonPixmapCache, load_app_font
 
-LOCALES = {
-    'en': {
-        'app_title': 'EN-OS Remote Assistant Creator',
-        'header': '🛠️ Remote Assistant Creator',
-        'token_label': 'Telegram Bot Token:',
-        'token_placeholder': 'Enter your Bot Token from @BotFather...',
-        'id_label': 'Admin Chat ID:',
-        'id_placeholder': 'Enter your Telegram Chat ID...',
-        'console_label': 'Build Output:',
-        'build_btn': '🛠️ Build Remote Assistant',
-        'clear_btn': '🗑️ Clear Console',
-        'help_btn': '❓ Instructions',
-        'language': 'Language',
-        'error_title': 'Error',
-        'success_title': 'Success',
-        'error_fields': 'Please fill in all fields!',
-        'error_build_running': 'Build already in progress...',
-        'success_build': 'Build completed successfully!',
-        'instructions': """
-📋 Instructions:
-
-1. Create a Telegram Bot using @BotFather
-2. Copy the Bot Token and paste it above
-3. Send a message to your bot and get your Chat ID using @userinfobot
-4. Click 'Build Remote Assistant' to compile the client
-5. The executable will be created as 'enclient'
-6. Application will start automatically and run on system startup
-        """
-    },
-    'ru': {
-        'app_title': 'EN-OS Remote Assistant Creator',
-        'header': '🛠️ Remote Assistant Creator',
-        'token_label': 'Токен Telegram Бота:',
-        'token_placeholder': 'Введите токен бота от @BotFather...',
-        'id_label': 'Ваш телеграм ID:',
-        'id_placeholder': 'Введите ваш Telegram ID...',
-        'console_label': 'Вывод сборки:',
-        'build_btn': '🛠️ Собрать Ассистента',
-        'clear_btn': '🗑️ Очистить консоль',
-        'help_btn': '❓ Инструкции',
-        'language': 'Язык',
-        'error_title': 'Ошибка',
-        'success_title': 'Успех',
-        'error_fields': 'Пожалуйста, заполните все поля!',
-        'error_build_running': 'Сборка уже выполняется...',
-        'success_build': 'Сборка успешно завершена!',
-        'instructions': """
-📋 Инструкции:
-
-1. Создайте бота в Telegram через @BotFather
-2. Скопируйте токен бота и вставьте выше
-3. Отправьте сообщение боту и получите ваш Chat ID через @userinfobot
-4. Нажмите 'Собрать Ассистента' для компиляции клиента
-5. Исполняемый файл будет создан как 'enclient'
-6. Приложение запустится автоматически и будет работать при старте системы
-        """
-    },
-    'es': {
-        'app_title': 'Creador de Asistente Remoto EN-OS',
-        'header': '🛠️ Creador de Asistente Remoto',
-        'token_label': 'Token del Bot de Telegram:',
-        'token_placeholder': 'Ingrese el token de su bot de @BotFather...',
-        'id_label': 'ID de Chat del Administrador:',
-        'id_placeholder': 'Ingrese su ID de chat de Telegram...',
-        'console_label': 'Salida de compilación:',
-        'build_btn': '🛠️ Crear Asistente Remoto',
-        'clear_btn': '🗑️ Limpiar Consola',
-        'help_btn': '❓ Instrucciones',
-        'language': 'Idioma',
-        'error_title': 'Error',
-        'success_title': 'Éxito',
-        'error_fields': '¡Por favor complete todos los campos!',
-        'error_build_running': 'La compilación ya está en progreso...',
-        'success_build': '¡Compilación completada con éxito!',
-        'instructions': """
-📋 Instrucciones:
-
-1. Crea un bot de Telegram usando @BotFather
-2. Copia el Token del Bot y pégalo arriba
-3. Envía un mensaje a tu bot y obtén tu Chat ID con @userinfobot
-4. Haz clic en 'Crear Asistente Remoto' para compilar
-5. Se creará el ejecutable 'enclient'
-6. La aplicación se iniciará automáticamente y se ejecutará al iniciar el sistema
-        """
-    },
-    'fr': {
-        'app_title': 'Créateur d\'Assistant Distant EN-OS',
-        'header': '🛠️ Créateur d\'Assistant Distant',
-        'token_label': 'Token du Bot Telegram :',
-        'token_placeholder': 'Entrez le token de votre bot depuis @BotFather...',
-        'id_label': 'ID de Chat Admin :',
-        'id_placeholder': 'Entrez votre ID de chat Telegram...',
-        'console_label': 'Sortie de compilation :',
-        'build_btn': '🛠️ Créer l\'Assistant Distant',
-        'clear_btn': '🗑️ Effacer la Console',
-        'help_btn': '❓ Instructions',
-        'language': 'Langue',
-        'error_title': 'Erreur',
-        'success_title': 'Succès',
-        'error_fields': 'Veuillez remplir tous les champs !',
-        'error_build_running': 'La compilation est déjà en cours...',
-        'success_build': 'Compilation terminée avec succès !',
-        'instructions': """
-📋 Instructions :
-
-1. Créez un bot Telegram via @BotFather
-2. Copiez le token du bot et collez-le ci-dessus
-3. Envoyez un message au bot et obtenez votre Chat ID avec @userinfobot
-4. Cliquez sur « Créer l'Assistant Distant » pour compiler
-5. L'exécutable 'enclient' sera créé
-6. L'application démarrera automatiquement au démarrage du système
-        """
-    },
-    'de': {
-        'app_title': 'EN-OS Fernassistenten-Ersteller',
-        'header': '🛠️ Fernassistenten-Ersteller',
-        'token_label': 'Telegram Bot Token:',
-        'token_placeholder': 'Geben Sie Ihren Bot-Token von @BotFather ein...',
-        'id_label': 'Admin-Chat-ID:',
-        'id_placeholder': 'Geben Sie Ihre Telegram-Chat-ID ein...',
-        'console_label': 'Build-Ausgabe:',
-        'build_btn': '🛠️ Fernassistenten erstellen',
-        'clear_btn': '🗑️ Konsole leeren',
-        'help_btn': '❓ Anleitung',
-        'language': 'Sprache',
-        'error_title': 'Fehler',
-        'success_title': 'Erfolg',
-        'error_fields': 'Bitte alle Felder ausfüllen!',
-        'error_build_running': 'Build läuft bereits...',
-        'success_build': 'Build erfolgreich abgeschlossen!',
-        'instructions': """
-📋 Anleitung:
-
-1. Erstellen Sie einen Telegram-Bot mit @BotFather
-2. Kopieren Sie den Bot-Token und fügen Sie ihn oben ein
-3. Senden Sie eine Nachricht an Ihren Bot und holen Sie Ihre Chat-ID mit @userinfobot
-4. Klicken Sie auf 'Fernassistenten erstellen' zum Kompilieren
-5. Die ausführbare Datei 'enclient' wird erstellt
-6. Die Anwendung startet automatisch und läuft beim Systemstart
-        """
-    },
-    'zh_CN': {
-        'app_title': 'EN-OS 远程助手创建器',
-        'header': '🛠️ 远程助手创建器',
-        'token_label': 'Telegram Bot 令牌：',
-        'token_placeholder': '请输入来自 @BotFather 的机器人令牌...',
-        'id_label': '管理员聊天 ID：',
-        'id_placeholder': '请输入您的 Telegram 聊天 ID...',
-        'console_label': '构建输出：',
-        'build_btn': '🛠️ 构建远程助手',
-        'clear_btn': '🗑️ 清除控制台',
-        'help_btn': '❓ 使用说明',
-        'language': '语言',
-        'error_title': '错误',
-        'success_title': '成功',
-        'error_fields': '请填写所有字段！',
-        'error_build_running': '构建已在进行中...',
-        'success_build': '构建成功完成！',
-        'instructions': """
-📋 使用说明：
-
-1. 通过 @BotFather 创建 Telegram 机器人
-2. 复制机器人令牌并粘贴到上方
-3. 向机器人发送消息，并通过 @userinfobot 获取您的 Chat ID
-4. 点击「构建远程助手」进行编译
-5. 将生成可执行文件「enclient」
-6. 程序将自动启动并设置为开机自启
-        """
-    },
-    'ja': {
-        'app_title': 'EN-OS リモートアシスタント作成ツール',
-        'header': '🛠️ リモートアシスタント作成ツール',
-        'token_label': 'Telegram Bot トークン：',
-        'token_placeholder': '@BotFather から取得したボットトークンを入力...',
-        'id_label': '管理者チャットID：',
-        'id_placeholder': 'あなたの Telegram チャットIDを入力...',
-        'console_label': 'ビルド出力：',
-        'build_btn': '🛠️ リモートアシスタントを作成',
-        'clear_btn': '🗑️ コンソールをクリア',
-        'help_btn': '❓ 使い方',
-        'language': '言語',
-        'error_title': 'エラー',
-        'success_title': '成功',
-        'error_fields': 'すべての項目を入力してください！',
-        'error_build_running': 'ビルドが既に実行中です...',
-        'success_build': 'ビルドが正常に完了しました！',
-        'instructions': """
-📋 使い方：
-
-1. @BotFather を使って Telegram ボットを作成
-2. ボットのトークンをコピーして上記に入力
-3. ボットにメッセージを送り、@userinfobot でチャットIDを取得
-4. 「リモートアシスタントを作成」をクリックしてコンパイル
-5. 実行ファイル「enclient」が作成されます
-6. アプリケーションは自動起動し、システム起動時に実行されます
-        """
-    },
-    'ko': {
-        'app_title': 'EN-OS 원격 지원 도구 제작기',
-        'header': '🛠️ 원격 지원 도구 제작기',
-        'token_label': 'Telegram 봇 토큰:',
-        'token_placeholder': '@BotFather에서 받은 봇 토큰을 입력하세요...',
-        'id_label': '관리자 채팅 ID:',
-        'id_placeholder': '당신의 Telegram 채팅 ID를 입력하세요...',
-        'console_label': '빌드 출력:',
-        'build_btn': '🛠️ 원격 지원 도구 빌드',
-        'clear_btn': '🗑️ 콘솔 지우기',
-        'help_btn': '❓ 사용 방법',
-        'language': '언어',
-        'error_title': '오류',
-        'success_title': '성공',
-        'error_fields': '모든 항목을 입력해 주세요!',
-        'error_build_running': '이미 빌드가 진행 중입니다...',
-        'success_build': '빌드가 성공적으로 완료되었습니다!',
-        'instructions': """
-📋 사용 방법:
-
-1. @BotFather를 통해 Telegram 봇 생성
-2. 봇 토큰을 복사하여 위에 붙여넣기
-3. 봇에게 메시지 전송 후 @userinfobot으로 채팅 ID 확인
-4. '원격 지원 도구 빌드' 버튼 클릭하여 컴파일
-5. 실행 파일 'enclient' 생성됨
-6. 프로그램은 자동 실행되며 시스템 시작 시 함께 실행
-        """
-    }
-}
+os.environ['XDG_RUNTIME_DIR'] = '/tmp/runtime-root'
 
 COLORS = {
     'primary': {
@@ -272,78 +46,22 @@ COLORS = {
     }
 }
 
-class LanguageManager:
-    def __init__(self):
-        self.current_language = self.detect_system_language()
-        self.load_language_setting()
-
-    def detect_system_language(self):
-        try:
-            lang_env = os.environ.get('LANG', '') or os.environ.get('LANGUAGE', '')
-            if lang_env:
-                lang_code = lang_env.split('_')[0].lower()
-                if lang_code in ['ru', 'uk']:
-                    return 'ru'
-
-            try:
-                system_locale = locale.getdefaultlocale()[0]
-                if system_locale:
-                    lang_code = system_locale.split('_')[0].lower()
-                    if lang_code in ['ru', 'uk']:
-                        return 'ru'
-            except:
-                pass
-
-        except Exception as e:
-            print(f"Language detection error: {e}")
-
-        return 'en'
-
-    def load_language_setting(self):
-        try:
-            config_dir = Path.home() / '.config' / 'enos_manager'
-            config_file = config_dir / 'settings.json'
-
-            if config_file.exists():
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                    saved_language = settings.get('language')
-                    if saved_language in LOCALES:
-                        self.current_language = saved_language
-        except Exception as e:
-            print(f"Error loading language settings: {e}")
-
-    def save_language_setting(self):
-        try:
-            config_dir = Path.home() / '.config' / 'enos_manager'
-            config_dir.mkdir(parents=True, exist_ok=True)
-
-            config_file = config_dir / 'settings.json'
-            settings = {'language': self.current_language}
-
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Error saving language settings: {e}")
-
-    def get_text(self, key):
-        return LOCALES[self.current_language].get(key, key)
-
-    def set_language(self, language):
-        if language in LOCALES:
-            self.current_language = language
-            self.save_language_setting()
-            return True
-        return False
-
 class BuildSignals(QObject):
     output_received = pyqtSignal(str)
     progress_updated = pyqtSignal(int, str)
     build_finished = pyqtSignal(bool, str)
 
+MINIMAL_BUTTON_COLORS = {
+    'blue': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['blue']},
+    'purple': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['purple']},
+    'cyan': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['cyan']},
+    'green': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['green']}
+}
+
 class MinimalButton(QPushButton):
     def __init__(self, text, icon=None, color_scheme='blue', parent=None):
         super().__init__(text, parent)
+        self.pixmap_cache = ButtonPixmapCache(self)
         self.setCursor(Qt.PointingHandCursor)
         self.setMinimumHeight(55)
         self.setFont(QFont("GNF", 14))
@@ -367,40 +85,44 @@ class MinimalButton(QPushButton):
         self.click_animation.setEasingCurve(QEasingCurve.OutCubic)
 
     def update_style(self):
-        colors = {
-            'blue': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['blue']},
-            'purple': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['purple']},
-            'cyan': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['cyan']},
-            'green': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['green']}
-        }
-
-        color = colors.get(self.color_scheme, colors['blue'])
-
-        self.setStyleSheet(f"""
-            MinimalButton {{
-                background-color: {color['bg']};
-                color: {color['text']};
-                border: 1px solid {COLORS['misc']['border']};
-                border-radius: 8px;
-                padding: 15px 20px;
-                text-align: center;
-                font-weight: normal;
-                font-size: 16px;
-            }}
-            MinimalButton:hover {{
-                background-color: {color['hover']};
-                border: 1px solid {color['text']};
-            }}
-            MinimalButton:pressed {{
-                background-color: {color['bg']};
-                border: 1px solid {color['text']};
-            }}
-        """)
+        scheme = self.color_scheme if self.color_scheme in MINIMAL_BUTTON_COLORS else 'blue'
+        register_stylesheet(('MinimalButton', 'assistant'), MinimalButton.build_stylesheet)
+        apply_button_style(self, 'assistant', scheme)
+        self.pixmap_cache.clear()
+
+    @staticmethod
+    def build_stylesheet():
+        rules = []
+        for scheme, color in MINIMAL_BUTTON_COLORS.items():
+            selector = button_selector('assistant', scheme)
+            rules.append(f"""
+                {selector} {{
+                    background-color: {color['bg']};
+                    color: {color['text']};
+                    border: 1px solid {COLORS['misc']['border']};
+                    border-radius: 8px;
+                    padding: 15px 20px;
+                    text-align: center;
+                    font-weight: normal;
+                    font-size: 16px;
+                }}
+                {selector}:hover {{
+                    background-color: {color['hover']};
+                    border: 1px solid {color['text']};
+                }}
+                {selector}:pressed {{
+                    background-color: {color['bg']};
+                    border: 1px solid {color['text']};
+                }}
+            """)
+        return ''.join(rules)
 
     def get_opacity(self):
         return self._opacity
 
     def set_opacity(self, opacity):
+        if opacity == self._opacity:
+            return
         self._opacity = opacity
         self.update()
 
@@ -408,6 +130,8 @@ class MinimalButton(QPushButton):
         return self._scale
 
     def set_scale(self, scale):
+        if scale == self._scale:
+            return
         self._scale = scale
         self.update()
 
@@ -443,13 +167,26 @@ class MinimalButton(QPushButton):
         super().mouseReleaseEvent(event)
 
     def paintEvent(self, event):
+        # В покое кнопку рисует стиль как обычно
+        if self._scale == 1.0 and self._opacity == 1.0:
+            super().paintEvent(event)
+            return
+
+        # Кадр анимации — масштабированная копия изображения текущего состояния
         painter = QPainter(self)
         painter.setOpacity(self._opacity)
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.translate(self.rect().center())
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+
+        center_x, center_y = self.width() / 2, self.height() / 2
+        painter.translate(center_x, center_y)
         painter.scale(self._scale, self._scale)
-        painter.translate(-self.rect().center())
-        super().paintEvent(event)
+        painter.translate(-center_x, -center_y)
+
+        painter.drawPixmap(0, 0, self.pixmap_cache.pixmap())
+
+    def changeEvent(self, event):
+        self.pixmap_cache.clear()
+        super().changeEvent(event)
 
 class ModernInput(QLineEdit):
     def __init__(self, placeholder="", parent=None):
@@ -476,36 +213,6 @@ class ModernInput(QLineEdit):
             }}
         """)
 
-class OutputConsole(QTextEdit):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setReadOnly(True)
-        self.setFont(QFont("Monospace", 9))
-
-        self.setStyleSheet(f"""
-            OutputConsole {{
-                background-color: {COLORS['primary']['dark']};
-                color: {COLORS['text']['secondary']};
-                border: 1px solid {COLORS['misc']['border']};
-                border-radius: 8px;
-                padding: 10px;
-                font-family: 'Monospace';
-            }}
-        """)
-
-    def append_output(self, text, color=None):
-        cursor = self.textCursor()
-        cursor.movePosition(QTextCursor.End)
-
-        if color:
-            self.setTextColor(QColor(color))
-        else:
-            self.setTextColor(QColor(COLORS['text']['secondary']))
-
-        cursor.insertText(text + '\n')
-        self.setTextCursor(cursor)
-        self.ensureCursorVisible()
-
 class BuildWorker:
     def __init__(self, token, chat_id, signals):
         self.token = token.strip()
@@ -578,7 +285,8 @@ class BuildWorker:
 class RemoteAssistantCreator(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.language_manager = LanguageManager()
+        self.language_manager = LanguageManager('assistant-creator')
+        self.language_manager.language_changed.connect(self.on_language_switched)
 
         self.setWindowTitle(self.language_manager.get_text('app_title'))
         self.setFixedSize(750, 800)
@@ -750,7 +458,8 @@ class RemoteAssistantCreator(QMainWindow):
         self.console_label.setStyleSheet(f"color: {COLORS['text']['primary']}; font-weight: bold; font-size: 13px;")
         parent_layout.addWidget(self.console_label)
 
-        self.console = OutputConsole()
+        self.console = OutputConsole(COLORS, log_name='assistant-creator')
+        self.console.load_older_text = self.language_manager.get_text('load_older')
         self.console.setMinimumHeight(200)
         parent_layout.addWidget(self.console)
 
@@ -802,8 +511,15 @@ class RemoteAssistantCreator(QMainWindow):
 
     def on_language_changed(self):
         language_code = self.language_combo.currentData()
-        if self.language_manager.set_language(language_code):
-            self.retranslate_ui()
+        # Тексты обновит on_language_switched по сигналу language_changed
+        self.language_manager.set_language(language_code)
+
+    def on_language_switched(self, language):
+        # Язык могли сменить и в другом окне: комбобокс догоняет его без повторного сигнала
+        self.language_combo.blockSignals(True)
+        self.language_combo.setCurrentIndex(self.language_combo.findData(language))
+        self.language_combo.blockSignals(False)
+        self.retranslate_ui()
 
     def retranslate_ui(self):
         self.setWindowTitle(self.language_manager.get_text('app_title'))
@@ -815,15 +531,12 @@ class RemoteAssistantCreator(QMainWindow):
         self.console_label.setText(self.language_manager.get_text('console_label'))
         self.build_btn.setText(self.language_manager.get_text('build_btn'))
         self.clear_btn.setText(self.language_manager.get_text('clear_btn'))
+        self.console.load_older_text = self.language_manager.get_text('load_older')
         self.help_btn.setText(self.language_manager.get_text('help_btn'))
 
     def load_fonts(self):
         try:
-            font_id = QFontDatabase.addApplicationFont("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
-            if font_id != -1:
-                font_family = QFontDatabase.applicationFontFamilies(font_id)[0]
-                app_font = QFont(font_family, 9)
-                QApplication.setFont(app_font)
+            load_app_font()
         except:
             pass
 
@@ -1,333 +1,52 @@
 #!/usr/bin/env python3
+import time
+# Отсчёт времени запуска до первого кадра — до импорта PyQt5
+START_TIME = time.perf_counter()
+
 import sys
 import os
 import subprocess
-import json
 import traceback
-import locale
+import importlib.util
 from pathlib import Path
 from PyQt5 import QtWidgets, QtGui
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QPushButton, QLabel, QFrame,
                              QMessageBox, QComboBox)
 from PyQt5.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve, pyqtProperty, QTimer
-from PyQt5.QtGui import (QIcon, QFont, QPalette, QColor, QLinearGradient,
-                         QPainter, QPixmap, QFontDatabase)
+from PyQt5.QtGui import (QIcon, QFont, QPalette, QColor, QPainter)
+
+from localization import LanguageManager
+from styles import button_selector, register_stylesheet, apply_button_style, ButtonPixmapCache, load_app_font
 
 os.environ['XDG_RUNTIME_DIR'] = '/tmp/runtime-root'
 
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
 
-LOCALES = {
-    'en': {
-        'app_title': 'EN-OS System Manager',
-        'header': 'EN-OS System Manager',
-        'driver_management': 'Driver Management',
-        'driver_desc': 'Install and update system drivers for optimal hardware performance',
-        'software_center': 'Software Center',
-        'software_desc': 'Browse and install applications from the Arch and EN-OS repository, you can also update the system',
-        'remote_assistant': 'Remote Assistant Creator',
-        'remote_desc': 'Create your own remote computer control solution',
-        'zapret_manager': 'EN-Zapret Manager',
-        'zapret_desc': 'Unblock YouTube in Russia without VPN',
-        'launch_driver': '🛠️ Driver Manager',
-        'launch_software': '📦 Software Center',
-        'launch_remote': '🌐 Remote Assistant Creator',
-        'launch_zapret': '🛡️ Zapret Manager',
-        'footer': 'EN-OS 1.0 Leningrad Region · Modern Arch-based Distribution · Built with ❤️',
-        'language': 'Language',
-        'error_title': 'Error',
-        'error_launch': 'Failed to launch {}: {}',
-        'error_file_not_found': 'File not found: {}',
-        'error_permission': 'Permission denied: {}',
-        'error_unknown': 'Unknown error: {}',
-        'settings_title': 'System Settings',
-        'system_tweaks': '⚙ System Tweaks',
-        'remove_autostart': '🗑 Remove Start Manager from Autostart',
-        'disable_kde_restore': '❌ Disable KDE Session Restore',
-        'refresh_mirrors': '🌐 Refresh Pacman Mirrors',
-        'clean_journal': '🗑️ Clean System Journal Logs',
-        'close': 'Close',
-        'info_autostart_removed': '✔️ Autostart already disabled',
-        'disable_pacman_keys_auto': '✔️ Disable automatic pacman keys initialization',
-        'enable_pacman_keys_auto':  '✔️ Enable automatic pacman keys initialization',
-        'ok_autostart_removed': '✔️ Start Manager removed from autostart',
-        'error_remove_autostart': '❌ Failed to remove autostart file',
-        'ok_kde_restore_disabled': '✔️ KDE session restore disabled.\nRestart KDE.',
-        'ok_mirrors_refreshed': '✔️ Pacman mirrors refreshed.',
-        'error_mirrors': '❌ Failed to refresh pacman mirrors.',
-        'ok_journal_cleaned': '✔️ System journal logs cleaned.',
-        'error_journal': '❌ Failed to clean journal logs.',
-    },
-    'ru': {
-        'app_title': 'EN-OS System Manager',
-        'header': 'EN-OS System Manager',
-        'driver_management': 'Driver Management',
-        'driver_desc': 'Установка и обновление системных драйверов для оптимальной работы оборудования',
-        'software_center': 'Software Center',
-        'software_desc': 'Просмотр и установка приложений из репозиториев Arch и EN-OS, также обновление системы',
-        'remote_assistant': 'Remote Assistant Creator',
-        'remote_desc': 'Создайте свое решение для удаленного управления компьютером',
-        'zapret_manager': 'EN-Zapret Manager',
-        'zapret_desc': 'Разблокировка YouTube в России без VPN',
-        'launch_driver': '🛠️ Driver Manager',
-        'launch_software': '📦 Software Center',
-        'launch_remote': '🌐 Remote Assistant Creator',
-        'launch_zapret': '🛡️ Zapret Manager',
-        'footer': 'EN-OS 1.0 · Современный дистрибутив на основе Arch · Создано с ❤️',
-        'language': 'Язык',
-        'error_title': 'Ошибка',
-        'error_launch': 'Не удалось запустить {}: {}',
-        'error_file_not_found': 'Файл не найден: {}',
-        'error_permission': 'Доступ запрещен: {}',
-        'error_unknown': 'Неизвестная ошибка: {}',
-        'settings_title': 'Настройки системы',
-        'system_tweaks': '⚙ Системные твики',
-        'remove_autostart': '🗑 Убрать Start Manager из автозагрузки',
-        'disable_kde_restore': '❌ Отключить восстановление сессии KDE',
-        'refresh_mirrors': '🌐 Обновить зеркала Pacman',
-        'clean_journal': '🗑️ Очистить логи журнала системы',
-        'close': 'Закрыть',
-        'info_autostart_removed': 'Автозагрузка уже отключена',
-        'ok_autostart_removed': 'Start Manager убран из автозагрузки',
-        'error_remove_autostart': 'Не удалось удалить файл автозагрузки',
-        'ok_kde_restore_disabled': 'Восстановление сессии KDE отключено.\nПерезапусти KDE.',
-        'disable_pacman_keys_auto': '❌ Отключить автоматическую инициализацию ключей pacman',
-        'enable_pacman_keys_auto':  '✔️ Включить авт. инициализацию ключей pacman',
-        'ok_baloo_disabled': 'Индексатор файлов Baloo отключен.\nПерезапусти KDE.',
-        'ok_fstrim_enabled': 'fstrim.timer включен для TRIM SSD.',
-        'error_fstrim': 'Не удалось включить fstrim.timer.',
-        'ok_mirrors_refreshed': 'Зеркала Pacman обновлены.',
-        'error_mirrors': 'Не удалось обновить зеркала Pacman.',
-        'ok_journal_cleaned': 'Логи журнала системы очищены.',
-        'error_journal': 'Не удалось очистить логи журнала.',
-    },
-    'es': {
-        'app_title': 'EN-OS System Manager',
-        'header': 'EN-OS System Manager',
-        'driver_management': 'Gestión de Controladores',
-        'driver_desc': 'Instalar y actualizar controladores del sistema para un rendimiento óptimo del hardware',
-        'software_center': 'Centro de Software',
-        'software_desc': 'Explorar e instalar aplicaciones desde los repositorios de Arch y EN-OS, también actualizar el sistema',
-        'remote_assistant': 'Creador de Asistente Remoto',
-        'remote_desc': 'Crea tu propia solución de control remoto de computadora',
-        'zapret_manager': 'EN-Zapret Manager',
-        'zapret_desc': 'Desbloquear YouTube en Rusia sin VPN',
-        'launch_driver': '🛠️ Gestor de Controladores',
-        'launch_software': '📦 Centro de Software',
-        'launch_remote': '🌐 Creador de Asistente Remoto',
-        'launch_zapret': '🛡️ Gestor de Zapret',
-        'footer': 'EN-OS 1.0 · Distribución moderna basada en Arch · Construido con ❤️',
-        'language': 'Idioma',
-        'error_title': 'Error',
-        'error_launch': 'No se pudo iniciar {}: {}',
-        'error_file_not_found': 'Archivo no encontrado: {}',
-        'error_permission': 'Permiso denegado: {}',
-        'error_unknown': 'Error desconocido: {}',
-        'settings_title': 'Configuraciones del Sistema',
-        'system_tweaks': '⚙ Ajustes del Sistema',
-        'remove_autostart': '🗑 Eliminar Start Manager del Inicio Automático',
-        'disable_kde_restore': '❌ Desactivar Restauración de Sesión KDE',
-        'refresh_mirrors': '🌐 Actualizar Espejos de Pacman',
-        'clean_journal': '🗑️ Limpiar Registros del Journal del Sistema',
-        'close': 'Cerrar',
-        'info_autostart_removed': 'Inicio automático ya desactivado',
-        'ok_autostart_removed': 'Start Manager eliminado del inicio automático',
-        'error_remove_autostart': 'No se pudo eliminar el archivo de inicio automático',
-        'disable_pacman_keys_auto': 'Desactivar inicialización automática de claves de pacman',
-        'enable_pacman_keys_auto':  '✔️ Activar inicialización automática de claves pacman',
-        'ok_kde_restore_disabled': 'Restauración de sesión KDE desactivada.\nReinicia KDE.',
-        'ok_baloo_disabled': 'Indexador de archivos Baloo desactivado.\nReinicia KDE.',
-        'ok_fstrim_enabled': 'fstrim.timer habilitado para TRIM SSD.',
-        'error_fstrim': 'No se pudo habilitar fstrim.timer.',
-        'ok_mirrors_refreshed': 'Espejos de Pacman actualizados.',
-        'error_mirrors': 'No se pudo actualizar espejos de Pacman.',
-        'ok_journal_cleaned': 'Registros del journal del sistema limpiados.',
-        'error_journal': 'No se pudo limpiar registros del journal.',
-    },
-    'zh_CN': {
-        'app_title': 'EN-OS 系统管理器',
-        'header': 'EN-OS 系统管理器',
-        'driver_management': '驱动管理',
-        'driver_desc': '安装和更新系统驱动程序以获得最佳硬件性能',
-        'software_center': '软件中心',
-        'software_desc': '浏览并从 Arch 和 EN-OS 仓库安装应用程序，也可更新系统',
-        'remote_assistant': '远程助手创建器',
-        'remote_desc': '创建您自己的远程电脑控制方案',
-        'zapret_manager': 'EN-Zapret 管理器',
-        'zapret_desc': '在俄罗斯不使用 VPN 解锁 YouTube',
-        'launch_driver': '🛠️ 驱动管理器',
-        'launch_software': '📦 软件中心',
-        'launch_remote': '🌐 远程助手创建器',
-        'launch_zapret': '🛡️ Zapret 管理器',
-        'footer': 'EN-OS 1.0 · 现代 Arch 系发行版 · 用 ❤️ 打造',
-        'language': '语言',
-        'error_title': '错误',
-        'error_launch': '无法启动 {}: {}',
-        'error_file_not_found': '文件未找到: {}',
-        'error_permission': '权限被拒绝: {}',
-        'error_unknown': '未知错误: {}',
-        'disable_pacman_keys_auto': '❌ 禁用 pacman 密钥自动初始化',
-        'enable_pacman_keys_auto':  '✔️ 启用 pacman 密钥自动初始化',
-        'settings_title': '系统设置',
-        'system_tweaks': '⚙ 系统优化',
-        'remove_autostart': '🗑 从开机启动中移除 Start Manager',
-        'disable_kde_restore': '❌ 禁用 KDE 会话恢复',
-        'refresh_mirrors': '🌐 刷新 Pacman 镜像',
-        'clean_journal': '🗑️ 清理系统日志',
-        'close': '关闭',
-    },
+# Инструменты, чьи окна открываются в этом же QApplication: файл модуля и класс главного окна
+IN_PROCESS_TOOLS = {
+    'driver-manager': ('EN-OS-Driver_Manager.py', 'DriverManager'),
+    'assistant-creator': ('EN-OS-Remote_Assistent_Creator.py', 'RemoteAssistantCreator'),
+}
 
-    'ja': {
-        'app_title': 'EN-OS システムマネージャー',
-        'header': 'EN-OS システムマネージャー',
-        'driver_management': 'ドライバ管理',
-        'driver_desc': '最適なハードウェアパフォーマンスのためのシステムドライバのインストール・更新',
-        'software_center': 'ソフトウェアセンター',
-        'software_desc': 'Arch および EN-OS リポジトリからアプリケーションを閲覧・インストール、システム更新も可能',
-        'remote_assistant': 'リモートアシスタント作成ツール',
-        'remote_desc': '自分だけのリモートパソコン制御ソリューションを作成',
-        'zapret_manager': 'EN-Zapret マネージャー',
-        'zapret_desc': 'VPNなしでロシアのYouTubeを解除',
-        'launch_driver': '🛠️ ドライバマネージャー',
-        'launch_software': '📦 ソフトウェアセンター',
-        'launch_remote': '🌐 リモートアシスタント作成ツール',
-        'launch_zapret': '🛡️ Zapret マネージャー',
-        'footer': 'EN-OS 1.0 · モダンArchベースディストリビューション · ❤️で作られました',
-        'language': '言語',
-        'error_title': 'エラー',
-        'error_launch': '{} の起動に失敗: {}',
-        'error_file_not_found': 'ファイルが見つかりません: {}',
-        'error_permission': '権限が拒否されました: {}',
-        'error_unknown': '不明なエラー: {}',
-        'disable_pacman_keys_auto': 'pacmanキーの自動初期化を無効化',
-        'enable_pacman_keys_auto':  '✔️ pacmanキーの自動初期化を有効にする',
-        'settings_title': 'システム設定',
-        'system_tweaks': '⚙ システム調整',
-        'remove_autostart': '🗑 スタートアップから Start Manager を削除',
-        'disable_kde_restore': '❌ KDE セッション復元を無効化',
-        'refresh_mirrors': '🌐 Pacman ミラーを更新',
-        'clean_journal': '🗑️ システムジャーナルログをクリーンアップ',
-        'close': '閉じる',
-    },
 
-    'ko': {
-        'app_title': 'EN-OS 시스템 관리자',
-        'header': 'EN-OS 시스템 관리자',
-        'driver_management': '드라이버 관리',
-        'driver_desc': '최적의 하드웨어 성능을 위한 시스템 드라이버 설치 및 업데이트',
-        'software_center': '소프트웨어 센터',
-        'software_desc': 'Arch 및 EN-OS 저장소에서 애플리케이션 탐색 및 설치, 시스템 업데이트 가능',
-        'remote_assistant': '원격 보조 도구 생성기',
-        'remote_desc': '나만의 원격 컴퓨터 제어 솔루션 만들기',
-        'zapret_manager': 'EN-Zapret 관리자',
-        'zapret_desc': 'VPN 없이 러시아에서 YouTube 차단 해제',
-        'launch_driver': '🛠️ 드라이버 관리자',
-        'launch_software': '📦 소프트웨어 센터',
-        'launch_remote': '🌐 원격 보조 도구 생성기',
-        'launch_zapret': '🛡️ Zapret 관리자',
-        'footer': 'EN-OS 1.0 · 모던 Arch 기반 배포판 · ❤️로 제작됨',
-        'language': '언어',
-        'error_title': '오류',
-        'error_launch': '{} 실행 실패: {}',
-        'error_file_not_found': '파일을 찾을 수 없음: {}',
-        'error_permission': '권한 거부: {}',
-        'error_unknown': '알 수 없는 오류: {}',
-        'settings_title': '시스템 설정',
-        'system_tweaks': '⚙ 시스템 튜닝',
-        'remove_autostart': '🗑 시작 관리자 자동 실행 제거',
-        'disable_pacman_keys_auto': '❌ pacman 키 자동 초기화 비활성화',
-        'enable_pacman_keys_auto':  '✔️ pacman 키 자동 초기화 활성화',
-        'disable_kde_restore': '❌ KDE 세션 복원 비활성화',
-        'refresh_mirrors': '🌐 Pacman 미러 새로고침',
-        'clean_journal': '🗑️ 시스템 저널 로그 정리',
-        'close': '닫기',
-    },
+def load_tool_module(file_name):
+    """Импортирует инструмент по имени файла (в именах есть дефисы) один раз на процесс."""
+    module_name = 'enos_' + os.path.splitext(file_name)[0].replace('-', '_').lower()
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(APP_DIR, file_name))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
 
-    'fr': {
-        'app_title': 'EN-OS System Manager',
-        'header': 'EN-OS System Manager',
-        'driver_management': 'Gestion des Pilotes',
-        'driver_desc': 'Installer et mettre à jour les pilotes système pour des performances optimales du matériel',
-        'software_center': 'Centre Logiciel',
-        'software_desc': 'Parcourir et installer des applications depuis les dépôts Arch et EN-OS, vous pouvez également mettre à jour le système',
-        'remote_assistant': 'Créateur d\'Assistant à Distance',
-        'remote_desc': 'Créez votre propre solution de contrôle à distance d\'ordinateur',
-        'zapret_manager': 'EN-Zapret Manager',
-        'zapret_desc': 'Débloquer YouTube en Russie sans VPN',
-        'launch_driver': '🛠️ Gestionnaire de Pilotes',
-        'launch_software': '📦 Centre Logiciel',
-        'launch_remote': '🌐 Créateur d\'Assistant à Distance',
-        'launch_zapret': '🛡️ Gestionnaire de Zapret',
-        'footer': 'EN-OS 1.0 · Distribution moderne basée sur Arch · Construit avec ❤️',
-        'language': 'Langue',
-        'error_title': 'Erreur',
-        'error_launch': 'Échec du lancement de {} : {}',
-        'error_file_not_found': 'Fichier non trouvé : {}',
-        'error_permission': 'Permission refusée : {}',
-        'error_unknown': 'Erreur inconnue : {}',
-        'settings_title': 'Paramètres du Système',
-        'system_tweaks': '⚙ Ajustements du Système',
-        'remove_autostart': '🗑 Supprimer Start Manager du Démarrage Automatique',
-        'disable_kde_restore': '❌ Désactiver la Restauration de Session KDE',
-        'refresh_mirrors': '🌐 Actualiser les Miroirs Pacman',
-        'clean_journal': '🗑️ Nettoyer les Journaux du Journal Système',
-        'close': 'Fermer',
-        'info_autostart_removed': 'Démarrage automatique déjà désactivé',
-        'disable_pacman_keys_auto': 'Désactiver l’initialisation automatique des clés pacman',
-        'enable_pacman_keys_auto':  '✔️ Activer l’initialisation automatique des clés pacman',
-        'ok_autostart_removed': 'Start Manager supprimé du démarrage automatique',
-        'error_remove_autostart': 'Échec de la suppression du fichier de démarrage automatique',
-        'ok_kde_restore_disabled': 'Restauration de session KDE désactivée.\nRedémarrez KDE.',
-        'error_fstrim': 'Échec de l\'activation de fstrim.timer.',
-        'ok_mirrors_refreshed': 'Miroirs Pacman actualisés.',
-        'error_mirrors': 'Échec de l\'actualisation des miroirs Pacman.',
-        'ok_journal_cleaned': 'Journaux du journal système nettoyés.',
-        'error_journal': 'Échec du nettoyage des journaux du journal.',
-    },
-    'de': {
-        'app_title': 'EN-OS System Manager',
-        'header': 'EN-OS System Manager',
-        'driver_management': 'Treiber-Management',
-        'driver_desc': 'Installieren und Aktualisieren von Systemtreibern für optimale Hardwareleistung',
-        'software_center': 'Software-Center',
-        'software_desc': 'Durchsuchen und Installieren von Anwendungen aus den Arch- und EN-OS-Repositories, Sie können auch das System aktualisieren',
-        'remote_assistant': 'Remote-Assistent-Ersteller',
-        'remote_desc': 'Erstellen Sie Ihre eigene Lösung zur Fernsteuerung des Computers',
-        'zapret_manager': 'EN-Zapret Manager',
-        'zapret_desc': 'YouTube in Russland ohne VPN entsperren',
-        'launch_driver': '🛠️ Treiber-Manager',
-        'launch_software': '📦 Software-Center',
-        'launch_remote': '🌐 Remote-Assistent-Ersteller',
-        'launch_zapret': '🛡️ Zapret-Manager',
-        'footer': 'EN-OS 1.0· Moderne Arch-basierte Distribution · Gebaut mit ❤️',
-        'language': 'Sprache',
-        'error_title': 'Fehler',
-        'error_launch': 'Fehler beim Starten von {}: {}',
-        'error_file_not_found': 'Datei nicht gefunden: {}',
-        'error_permission': 'Zugriff verweigert: {}',
-        'error_unknown': 'Unbekannter Fehler: {}',
-        'disable_pacman_keys_auto': '❌ Automatische Initialisierung der pacman-Schlüssel deaktivieren',
-        'settings_title': 'Systemeinstellungen',
-        'enable_pacman_keys_auto':  '✔️ Automatische Initialisierung der pacman-Schlüssel aktivieren',
-        'system_tweaks': '⚙ Systemanpassungen',
-        'remove_autostart': '🗑 Start Manager aus Autostart entfernen',
-        'disable_kde_restore': '❌ KDE-Sitzungswiederherstellung deaktivieren',
-        'refresh_mirrors': '🌐 Pacman-Spiegel aktualisieren',
-        'clean_journal': '🗑️ System-Journal-Protokolle bereinigen',
-        'close': 'Schließen',
-        'info_autostart_removed': 'Autostart bereits deaktiviert',
-        'ok_autostart_removed': 'Start Manager aus Autostart entfernt',
-        'error_remove_autostart': 'Fehler beim Entfernen der Autostart-Datei',
-        'ok_kde_restore_disabled': 'KDE-Sitzungswiederherstellung deaktiviert.\nStarten Sie KDE neu.',
-        'ok_baloo_disabled': 'Baloo-Dateiindexierer deaktiviert.\nStarten Sie KDE neu.',
-        'ok_fstrim_enabled': 'fstrim.timer für SSD-TRIM aktiviert.',
-        'error_fstrim': 'Fehler beim Aktivieren von fstrim.timer.',
-        'ok_mirrors_refreshed': 'Pacman-Spiegel aktualisiert.',
-        'error_mirrors': 'Fehler beim Aktualisieren der Pacman-Spiegel.',
-        'ok_journal_cleaned': 'System-Journal-Protokolle bereinigt.',
-        'error_journal': 'Fehler beim Bereinigen der Journal-Protokolle.',
-    },
-}
 
 COLORS = {
     'primary': {
@@ -353,84 +72,17 @@ COLORS = {
     }
 }
 
-class LanguageManager:
-    def __init__(self):
-        self.current_language = self.detect_system_language()
-        self.load_language_setting()
-
-    def detect_system_language(self):
-        lang_map = {
-            'en': 'en',
-            'ru': 'ru',
-            'uk': 'ru',
-            'es': 'es',
-            'fr': 'fr',
-            'de': 'de',
-        }
-        default = 'en'
-
-        try:
-            lang_env = os.environ.get('LANG', '') or os.environ.get('LANGUAGE', '')
-            if lang_env:
-                lang_code = lang_env.split('_')[0].lower()
-                return lang_map.get(lang_code, default)
-
-            system_locale = locale.getdefaultlocale()[0]
-            if system_locale:
-                lang_code = system_locale.split('_')[0].lower()
-                return lang_map.get(lang_code, default)
-
-            result = subprocess.run(['locale'], capture_output=True, text=True, timeout=2)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if line.startswith('LANG=') or line.startswith('LANGUAGE='):
-                        lang_code = line.split('=')[1].split('_')[0].lower().replace('"', '')
-                        return lang_map.get(lang_code, default)
-        except Exception as e:
-            print(f"Language detection error: {e}")
-
-        return default
-
-    def load_language_setting(self):
-        try:
-            config_dir = Path.home() / '.config' / 'enos_manager'
-            config_file = config_dir / 'settings.json'
-
-            if config_file.exists():
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                    saved_language = settings.get('language')
-                    if saved_language in LOCALES:
-                        self.current_language = saved_language
-        except Exception as e:
-            print(f"Error loading language settings: {e}")
-
-    def save_language_setting(self):
-        try:
-            config_dir = Path.home() / '.config' / 'enos_manager'
-            config_dir.mkdir(parents=True, exist_ok=True)
-
-            config_file = config_dir / 'settings.json'
-            settings = {'language': self.current_language}
-
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Error saving language settings: {e}")
-
-    def get_text(self, key):
-        return LOCALES[self.current_language].get(key, key)
-
-    def set_language(self, language):
-        if language in LOCALES:
-            self.current_language = language
-            self.save_language_setting()
-            return True
-        return False
+MINIMAL_BUTTON_COLORS = {
+    'blue': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['blue']},
+    'purple': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['purple']},
+    'cyan': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['cyan']},
+    'green': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': '#4cd964'}
+}
 
 class MinimalButton(QPushButton):
     def __init__(self, text, icon=None, color_scheme='blue', parent=None):
         super().__init__(text, parent)
+        self.pixmap_cache = ButtonPixmapCache(self)
         self.setCursor(Qt.PointingHandCursor)
         self.setFixedHeight(70)
         self.setFont(QFont("GNF", 44))
@@ -454,40 +106,44 @@ class MinimalButton(QPushButton):
         self.click_animation.setEasingCurve(QEasingCurve.OutCubic)
 
     def update_style(self):
-        colors = {
-            'blue': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['blue']},
-            'purple': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['purple']},
-            'cyan': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': COLORS['accent']['cyan']},
-            'green': {'bg': '#2a2a4a', 'hover': '#3a3a5a', 'text': '#4cd964'}
-        }
-
-        color = colors.get(self.color_scheme, colors['blue'])
-
-        self.setStyleSheet(f"""
-            MinimalButton {{
-                background-color: {color['bg']};
-                color: {color['text']};
-                border: 1px solid {COLORS['misc']['border']};
-                border-radius: 8px;
-                padding: 15px 20px;
-                text-align: center;
-                font-weight: normal;
-                font-size: 20px;
-            }}
-            MinimalButton:hover {{
-                background-color: {color['hover']};
-                border: 1px solid {color['text']};
-            }}
-            MinimalButton:pressed {{
-                background-color: {color['bg']};
-                border: 1px solid {color['text']};
-            }}
-        """)
+        scheme = self.color_scheme if self.color_scheme in MINIMAL_BUTTON_COLORS else 'blue'
+        register_stylesheet(('MinimalButton', 'start'), MinimalButton.build_stylesheet)
+        apply_button_style(self, 'start', scheme)
+        self.pixmap_cache.clear()
+
+    @staticmethod
+    def build_stylesheet():
+        rules = []
+        for scheme, color in MINIMAL_BUTTON_COLORS.items():
+            selector = button_selector('start', scheme)
+            rules.append(f"""
+                {selector} {{
+                    background-color: {color['bg']};
+                    color: {color['text']};
+                    border: 1px solid {COLORS['misc']['border']};
+                    border-radius: 8px;
+                    padding: 15px 20px;
+                    text-align: center;
+                    font-weight: normal;
+                    font-size: 20px;
+                }}
+                {selector}:hover {{
+                    background-color: {color['hover']};
+                    border: 1px solid {color['text']};
+                }}
+                {selector}:pressed {{
+                    background-color: {color['bg']};
+                    border: 1px solid {color['text']};
+                }}
+            """)
+        return ''.join(rules)
 
     def get_opacity(self):
         return self._opacity
 
     def set_opacity(self, opacity):
+        if opacity == self._opacity:
+            return
         self._opacity = opacity
         self.update()
 
@@ -495,6 +151,8 @@ class MinimalButton(QPushButton):
         return self._scale
 
     def set_scale(self, scale):
+        if scale == self._scale:
+            return
         self._scale = scale
         self.update()
 
@@ -530,15 +188,26 @@ class MinimalButton(QPushButton):
         super().mouseReleaseEvent(event)
 
     def paintEvent(self, event):
+        # В покое кнопку рисует стиль как обычно
+        if self._scale == 1.0 and self._opacity == 1.0:
+            super().paintEvent(event)
+            return
+
+        # Кадр анимации — масштабированная копия изображения текущего состояния
         painter = QPainter(self)
         painter.setOpacity(self._opacity)
-        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
 
-        painter.translate(self.rect().center())
+        center_x, center_y = self.width() / 2, self.height() / 2
+        painter.translate(center_x, center_y)
         painter.scale(self._scale, self._scale)
-        painter.translate(-self.rect().center())
+        painter.translate(-center_x, -center_y)
 
-        super().paintEvent(event)
+        painter.drawPixmap(0, 0, self.pixmap_cache.pixmap())
+
+    def changeEvent(self, event):
+        self.pixmap_cache.clear()
+        super().changeEvent(event)
 
 class ModernCard(QFrame):
     def __init__(self, title, description, icon=None, parent=None):
@@ -566,8 +235,8 @@ class ModernCard(QFrame):
         text_layout = QVBoxLayout()
         text_layout.setSpacing(4)
 
-        title_label = QLabel(title)
-        title_label.setStyleSheet(f"""
+        self.title_label = QLabel(title)
+        self.title_label.setStyleSheet(f"""
             QLabel {{
                 color: {COLORS['text']['primary']};
                 font-size: 14px;
@@ -575,25 +244,30 @@ class ModernCard(QFrame):
             }}
         """)
 
-        desc_label = QLabel(description)
-        desc_label.setStyleSheet(f"""
+        self.desc_label = QLabel(description)
+        self.desc_label.setStyleSheet(f"""
             QLabel {{
                 color: {COLORS['text']['secondary']};
                 font-size: 12px;
             }}
         """)
-        desc_label.setWordWrap(True)
-        desc_label.setFixedHeight(70)
-        desc_label.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.desc_label.setWordWrap(True)
+        self.desc_label.setFixedHeight(70)
+        self.desc_label.setAlignment(Qt.AlignTop | Qt.AlignLeft)
 
-        text_layout.addWidget(title_label)
-        text_layout.addWidget(desc_label)
+        text_layout.addWidget(self.title_label)
+        text_layout.addWidget(self.desc_label)
         layout.addLayout(text_layout)
 
+    def set_texts(self, title, description):
+        self.title_label.setText(title)
+        self.desc_label.setText(description)
+
 class ENOSStarter(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.language_manager = LanguageManager()
+        self.language_manager = LanguageManager('start-manager')
+        self.language_manager.language_changed.connect(self.on_language_switched)
 
         self.setWindowTitle(self.language_manager.get_text('app_title'))
         self.setFixedSize(900, 700)
@@ -615,10 +289,40 @@ class ENOSStarter(QMainWindow):
 
         self.create_header(main_layout)
         self.create_cards_section(main_layout)
-        self.create_buttons_section(main_layout)
+
+        # Кнопки и Mini-Tweaker строятся после первого кадра, пока окно проявляется
+        self.deferred_layout = QVBoxLayout()
+        self.deferred_layout.setSpacing(15)
+        main_layout.addLayout(self.deferred_layout)
 
         main_layout.addStretch()
 
+        self.create_footer(main_layout)
+
+        self._window_opacity = 1.0
+        self.settings_window = None
+        self.tool_windows = {}
+        self.deferred_built = False
+        self.first_frame_reported = False
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_frame_reported:
+            self.first_frame_reported = True
+            # Приложение стартует из автозапуска, поэтому замер выводится только по запросу
+            if os.environ.get('ENOS_STARTUP_TIMING'):
+                print(f"Startup: first frame in {(time.perf_counter() - START_TIME) * 1000:.0f} ms")
+            QTimer.singleShot(0, self.build_deferred_widgets)
+
+    def build_deferred_widgets(self):
+        if self.deferred_built:
+            return
+        self.deferred_built = True
+
+        self.create_buttons_section(self.deferred_layout)
+        self.create_settings_button(self.deferred_layout)
+
+    def create_settings_button(self, parent_layout):
         settings_layout = QHBoxLayout()
         settings_layout.addStretch()
 
@@ -648,16 +352,13 @@ class ENOSStarter(QMainWindow):
         settings_layout.addWidget(self.settings_btn)
         settings_layout.addStretch()
 
-        main_layout.addLayout(settings_layout)
-
-
-        self.create_footer(main_layout)
-
-        self._window_opacity = 1.0
+        parent_layout.addLayout(settings_layout)
 
     def open_settings(self):
-        dlg = SettingsWindow(self.language_manager, self)
-        dlg.exec_()
+        # Диалог создаётся при первом открытии и дальше переиспользуется
+        if self.settings_window is None:
+            self.settings_window = SettingsWindow(self.language_manager, self)
+        self.settings_window.exec_()
 
     def create_header(self, parent_layout):
         header_layout = QHBoxLayout()
@@ -833,20 +534,15 @@ class ENOSStarter(QMainWindow):
 
     def on_language_changed(self):
         language_code = self.language_combo.currentData()
-        if self.language_manager.set_language(language_code):
-            self.restart_application()
-
-    def restart_application(self):
-        import sys
-        import os
-
-        self.close()
+        # Тексты обновит on_language_switched по сигналу language_changed
+        self.language_manager.set_language(language_code)
 
-        os.execl(
-            sys.executable,
-            sys.executable,
-            *sys.argv
-        )
+    def on_language_switched(self, language):
+        # Язык могли сменить и в другом окне: комбобокс догоняет его без повторного сигнала
+        self.language_combo.blockSignals(True)
+        self.language_combo.setCurrentIndex(self.language_combo.findData(language))
+        self.language_combo.blockSignals(False)
+        self.retranslate_ui()
 
     def retranslate_ui(self):
         self.setWindowTitle(self.language_manager.get_text('app_title'))
@@ -855,6 +551,10 @@ class ENOSStarter(QMainWindow):
 
         self.update_card_descriptions()
 
+        if not self.deferred_built:
+            self.footer_label.setText(self.language_manager.get_text('footer'))
+            return
+
         self.driver_btn.setText(self.language_manager.get_text('launch_driver'))
         self.packages_btn.setText(self.language_manager.get_text('launch_software'))
         self.updater_btn.setText(self.language_manager.get_text('launch_remote'))
@@ -863,25 +563,20 @@ class ENOSStarter(QMainWindow):
         self.footer_label.setText(self.language_manager.get_text('footer'))
 
     def update_card_descriptions(self):
-        for card, desc_key in [
-            (self.card1, 'driver_desc'),
-            (self.card2, 'software_desc'),
-            (self.card3, 'remote_desc'),
-            (self.card4, 'zapret_desc')
+        for card, title_key, desc_key in [
+            (self.card1, 'driver_management', 'driver_desc'),
+            (self.card2, 'software_center', 'software_desc'),
+            (self.card3, 'remote_assistant', 'remote_desc'),
+            (self.card4, 'zapret_manager', 'zapret_desc')
         ]:
-            text_layout = card.layout().itemAt(1).layout()
-            if text_layout and text_layout.count() >= 2:
-                desc_label = text_layout.itemAt(1).widget()
-                if isinstance(desc_label, QLabel):
-                    desc_label.setText(self.language_manager.get_text(desc_key))
+            card.set_texts(
+                self.language_manager.get_text(title_key),
+                self.language_manager.get_text(desc_key)
+            )
 
     def load_fonts(self):
         try:
-            font_id = QFontDatabase.addApplicationFont("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
-            if font_id != -1:
-                font_family = QFontDatabase.applicationFontFamilies(font_id)[0]
-                app_font = QFont(font_family, 9)
-                QApplication.setFont(app_font)
+            load_app_font()
         except Exception as e:
             print(f"Font loading error: {e}")
 
@@ -972,13 +667,31 @@ class ENOSStarter(QMainWindow):
 
         return False
 
+    def open_tool_window(self, tool, command, app_name):
+        # Окно создаётся при первом открытии; закрытое окно только скрыто и открывается снова сразу
+        window = self.tool_windows.get(tool)
+        if window is None:
+            file_name, class_name = IN_PROCESS_TOOLS[tool]
+            try:
+                window = getattr(load_tool_module(file_name), class_name)()
+            except Exception:
+                print(f"Cannot open {app_name} in-process, starting {command[0]}:")
+                traceback.print_exc()
+                return self.safe_launch(command, app_name)
+            self.tool_windows[tool] = window
+
+        window.show()
+        window.raise_()
+        window.activateWindow()
+        return True
+
     def launch_driver_manager(self):
         app_name = self.language_manager.get_text('driver_management')
-        self.safe_launch(["/usr/bin/enos-driver-manager"], app_name)
+        self.open_tool_window('driver-manager', ["/usr/bin/enos-driver-manager"], app_name)
 
     def launch_assist_creator(self):
         app_name = self.language_manager.get_text('remote_assistant')
-        self.safe_launch(["/usr/bin/enos-assistant-creator"], app_name)
+        self.open_tool_window('assistant-creator', ["/usr/bin/enos-assistant-creator"], app_name)
 
     def launch_package_installer(self):
         app_name = self.language_manager.get_text('software_center')
@@ -1009,6 +722,8 @@ class SettingsWindow(QtWidgets.QDialog):
     def __init__(self, language_manager, parent=None):
         super().__init__(parent)
         self.language_manager = language_manager
+        # Диалог живёт вместе с главным окном, поэтому переводится по тому же сигналу
+        self.language_manager.language_changed.connect(self.retranslate_ui)
 
         self.setWindowTitle(self.language_manager.get_text('settings_title'))
         self.setFixedSize(550, 500)  # Increased size for more buttons
@@ -1035,15 +750,15 @@ class SettingsWindow(QtWidgets.QDialog):
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(12)
 
-        title = QLabel(self.language_manager.get_text('system_tweaks'))
-        title.setStyleSheet(f"""
+        self.title_label = QLabel(self.language_manager.get_text('system_tweaks'))
+        self.title_label.setStyleSheet(f"""
             QLabel {{
                 color: {COLORS['accent']['blue']};
                 font-size: 18px;
                 font-weight: bold;
             }}
         """)
-        layout.addWidget(title)
+        layout.addWidget(self.title_label)
 
         self.remove_autostart_btn = QPushButton(self.language_manager.get_text('remove_autostart'))
         self.remove_autostart_btn.clicked.connect(self.remove_enos_autostart)
@@ -1071,9 +786,20 @@ class SettingsWindow(QtWidgets.QDialog):
 
         layout.addStretch()
 
-        close_btn = QPushButton(self.language_manager.get_text('close'))
-        close_btn.clicked.connect(self.close)
-        layout.addWidget(close_btn)
+        self.close_btn = QPushButton(self.language_manager.get_text('close'))
+        self.close_btn.clicked.connect(self.close)
+        layout.addWidget(self.close_btn)
+
+    def retranslate_ui(self):
+        self.setWindowTitle(self.language_manager.get_text('settings_title'))
+        self.title_label.setText(self.language_manager.get_text('system_tweaks'))
+        self.remove_autostart_btn.setText(self.language_manager.get_text('remove_autostart'))
+        self.disable_kde_restore_btn.setText(self.language_manager.get_text('disable_kde_restore'))
+        self.refresh_mirrors_btn.setText(self.language_manager.get_text('refresh_mirrors'))
+        self.clean_journal_btn.setText(self.language_manager.get_text('clean_journal'))
+        self.enable_keys_auto_btn.setText(self.language_manager.get_text('enable_pacman_keys_auto'))
+        self.disable_keys_auto_btn.setText(self.language_manager.get_text('disable_pacman_keys_auto'))
+        self.close_btn.setText(self.language_manager.get_text('close'))
 
     def remove_enos_autostart(self):
         home_dir = os.path.expanduser("~")
@@ -0,0 +1,156 @@
+# Правка параметров ядра в /etc/default/grub без sed: разбор, изменение и атомарная запись.
+# Запускается от root одной командой: python3 grub_config.py --add nomodeset
+import os
+import re
+import sys
+import shutil
+import argparse
+import tempfile
+
+GRUB_DEFAULT_FILE = '/etc/default/grub'
+CMDLINE_KEY = 'GRUB_CMDLINE_LINUX_DEFAULT'
+
+# Строки, по которым вызывающий код понимает результат
+RESULT_CHANGED = 'GRUB cmdline changed:'
+RESULT_UNCHANGED = 'GRUB cmdline unchanged:'
+
+# Любая строка присваивания, в том числе та, которую не получится разобрать
+ASSIGNMENT_RE = re.compile(r'^[ \t]*(?:export[ \t]+)?' + CMDLINE_KEY + r'=.*$', re.MULTILINE)
+# Разбираемое присваивание: необязательный export, значение и хвост с комментарием
+CMDLINE_RE = re.compile(
+    r'([ \t]*(?:export[ \t]+)?' + CMDLINE_KEY + r'=)'
+    r'(?:"([^"\\$`]*)"|\'([^\']*)\'|([^\s"\'#\\$`]*))'
+    r'((?:[ \t]+#.*)?[ \t]*)'
+)
+
+
+def _last_assignment(content):
+    """Последняя строка присваивания и её разбор; ValueError, если строка есть, но не разбирается."""
+    lines = list(ASSIGNMENT_RE.finditer(content))
+    if not lines:
+        return None, None
+    line = lines[-1]
+    match = CMDLINE_RE.fullmatch(line.group(0))
+    # Кавычки внутри значения — параметр ядра с пробелами, split() его бы разорвал
+    if match is None or (match.group(3) is not None and '"' in match.group(3)):
+        raise ValueError(f"Cannot parse {CMDLINE_KEY} line: {line.group(0).strip()}")
+    return line, match
+
+
+def _quote(params, quote='"'):
+    """Значение в кавычках того же вида, что были в файле; ValueError, если оно их не выдержит."""
+    value = " ".join(params)
+    unsafe = "'" if quote == "'" else '"\\$`'
+    if any(char in value for char in unsafe):
+        raise ValueError(f"Cannot write {value!r} inside {quote} quotes")
+    return f"{quote}{value}{quote}"
+
+
+def parse_cmdline(content):
+    """Параметры из последней строки GRUB_CMDLINE_LINUX_DEFAULT или None, если её нет."""
+    _, match = _last_assignment(content)
+    if match is None:
+        return None
+    value = next((group for group in match.groups()[1:4] if group is not None), '')
+    return value.split()
+
+
+def _param_name(param):
+    return param.split('=', 1)[0]
+
+
+def edit_params(params, add=(), remove=()):
+    """Новый список параметров: remove убирает по имени, add добавляет или заменяет значение."""
+    removed = {_param_name(param) for param in remove}
+    result = [param for param in params if _param_name(param) not in removed]
+
+    for param in add:
+        name = _param_name(param)
+        for i, existing in enumerate(result):
+            if _param_name(existing) == name:
+                result[i] = param
+                break
+        else:
+            result.insert(0, param)
+
+    return result
+
+
+def update_cmdline(content, add=(), remove=()):
+    """Возвращает (новое содержимое, новые параметры, изменилось ли что-нибудь)."""
+    line, match = _last_assignment(content)
+    if line is None:
+        # Строки нет совсем — добавляем её в конец
+        new_params = edit_params([], add, remove)
+        if not new_params:
+            return content, new_params, False
+        suffix = '' if content.endswith('\n') or not content else '\n'
+        return content + f'{suffix}{CMDLINE_KEY}={_quote(new_params)}\n', new_params, True
+
+    params = parse_cmdline(line.group(0))
+    new_params = edit_params(params, add, remove)
+    if new_params == params:
+        return content, params, False
+
+    # Префикс (отступ, export), вид кавычек и комментарий в конце строки сохраняются
+    quote = "'" if match.group(3) is not None else '"'
+    new_line = f'{match.group(1)}{_quote(new_params, quote)}{match.group(5)}'
+    return content[:line.start()] + new_line + content[line.end():], new_params, True
+
+
+def write_atomic(path, content, backup_path=None):
+    """Пишет во временный файл рядом с path и переименовывает его поверх оригинала."""
+    directory = os.path.dirname(path) or '.'
+    st = os.stat(path)
+
+    if backup_path:
+        shutil.copy2(path, backup_path)
+
+    fd, tmp_path = tempfile.mkstemp(prefix='.grub.', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, st.st_mode & 0o7777)
+        os.chown(tmp_path, st.st_uid, st.st_gid)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def apply(path=GRUB_DEFAULT_FILE, add=(), remove=(), backup=True):
+    """Меняет параметры в файле; возвращает (параметры, изменилось ли что-нибудь)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    new_content, params, changed = update_cmdline(content, add, remove)
+    if changed:
+        write_atomic(path, new_content, path + '.backup' if backup else None)
+    return params, changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Edit kernel parameters in /etc/default/grub')
+    parser.add_argument('--file', default=GRUB_DEFAULT_FILE)
+    parser.add_argument('--add', action='append', default=[], metavar='PARAM')
+    parser.add_argument('--remove', action='append', default=[], metavar='PARAM')
+    parser.add_argument('--no-backup', action='store_true')
+    args = parser.parse_args(argv)
+
+    try:
+        params, changed = apply(args.file, args.add, args.remove, not args.no_backup)
+    except (OSError, ValueError) as e:
+        print(f"Cannot update {args.file}: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{RESULT_CHANGED if changed else RESULT_UNCHANGED} {' '.join(params)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
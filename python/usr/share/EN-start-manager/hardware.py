@@ -0,0 +1,205 @@
+# Определение видеокарт напрямую через sysfs, без запуска lspci
+import os
+import json
+import bisect
+import hashlib
+import tempfile
+from pathlib import Path
+from collections import namedtuple
+
+SYSFS_PCI_DEVICES = '/sys/bus/pci/devices'
+PCI_IDS_PATHS = ['/usr/share/hwdata/pci.ids', '/usr/share/misc/pci.ids']
+CACHE_FILE = Path.home() / '.config' / 'enos_manager' / 'hardware_cache.json'
+NVIDIA_BRANCHES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nvidia_branches.json')
+
+# Класс 0x03xxxx — Display controller (VGA, 3D, Display)
+PCI_CLASS_DISPLAY = 0x03
+
+GPU_VENDORS = {
+    '10de': 'nvidia',
+    '1002': 'amd',
+    '1022': 'amd',
+    '8086': 'intel',
+}
+
+PciDevice = namedtuple('PciDevice', ['slot', 'vendor_id', 'device_id'])
+
+
+def _read_hex(path):
+    with open(path, 'r') as f:
+        return int(f.read().strip(), 16)
+
+
+def scan_display_devices(sysfs_dir=SYSFS_PCI_DEVICES):
+    """Все PCI-устройства класса 0x03 из sysfs."""
+    devices = []
+    try:
+        slots = sorted(os.listdir(sysfs_dir))
+    except OSError as e:
+        print(f"Error reading {sysfs_dir}: {e}")
+        return devices
+
+    for slot in slots:
+        device_dir = os.path.join(sysfs_dir, slot)
+        try:
+            if _read_hex(os.path.join(device_dir, 'class')) >> 16 != PCI_CLASS_DISPLAY:
+                continue
+            vendor_id = _read_hex(os.path.join(device_dir, 'vendor'))
+            device_id = _read_hex(os.path.join(device_dir, 'device'))
+        except (OSError, ValueError):
+            continue
+        devices.append(PciDevice(slot, f"{vendor_id:04x}", f"{device_id:04x}"))
+
+    return devices
+
+
+def lookup_pci_name(vendor_id, device_id, pci_ids_paths=PCI_IDS_PATHS):
+    """Имя устройства из pci.ids в стиле lspci: "<vendor> <device>"."""
+    for path in pci_ids_paths:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                vendor_name = None
+                for line in f:
+                    if line.startswith('#') or not line.strip():
+                        continue
+                    if vendor_name is None:
+                        if line.startswith(vendor_id + '  '):
+                            vendor_name = line[len(vendor_id):].strip()
+                        continue
+                    if not line.startswith('\t'):
+                        # Начался следующий производитель
+                        break
+                    if line.startswith('\t' + device_id + '  '):
+                        return f"{vendor_name} {line[len(device_id) + 1:].strip()}"
+                if vendor_name is not None:
+                    return f"{vendor_name} [{vendor_id}:{device_id}]"
+        except OSError:
+            continue
+
+    return f"[{vendor_id}:{device_id}]"
+
+
+def pci_fingerprint(sysfs_dir=SYSFS_PCI_DEVICES, pci_ids_paths=PCI_IDS_PATHS):
+    """Дешёвый отпечаток топологии PCI: список слотов, без чтения файлов устройств."""
+    digest = hashlib.sha1()
+    try:
+        # mtime записей sysfs не годится: kernfs ставит его при создании inode, а не при загрузке
+        for slot in sorted(os.listdir(sysfs_dir)):
+            digest.update(f"{slot};".encode())
+    except OSError:
+        return None
+
+    # Обновление hwdata меняет имена моделей
+    for path in pci_ids_paths:
+        try:
+            digest.update(f"{path}:{os.stat(path).st_mtime_ns};".encode())
+        except OSError:
+            continue
+
+    return digest.hexdigest()
+
+
+def load_cached_gpus(fingerprint, cache_file=CACHE_FILE, sysfs_dir=SYSFS_PCI_DEVICES):
+    """Список (vendor, model, PciDevice) из кэша или None, если топология изменилась."""
+    if fingerprint is None:
+        return None
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('fingerprint') != fingerprint:
+            return None
+        gpus = [
+            (gpu['vendor'], gpu['model'], PciDevice(gpu['slot'], gpu['vendor_id'], gpu['device_id']))
+            for gpu in cache['gpus']
+        ]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    # Карту могли заменить в том же слоте: перечитываются только ID закэшированных видеокарт
+    for _, _, device in gpus:
+        device_dir = os.path.join(sysfs_dir, device.slot)
+        try:
+            vendor_id = _read_hex(os.path.join(device_dir, 'vendor'))
+            device_id = _read_hex(os.path.join(device_dir, 'device'))
+        except (OSError, ValueError):
+            return None
+        if (f"{vendor_id:04x}", f"{device_id:04x}") != (device.vendor_id, device.device_id):
+            return None
+    return gpus
+
+
+def save_cached_gpus(fingerprint, gpus, cache_file=CACHE_FILE):
+    if fingerprint is None:
+        return
+    cache = {
+        'fingerprint': fingerprint,
+        'gpus': [
+            {
+                'vendor': vendor,
+                'model': model,
+                'slot': device.slot,
+                'vendor_id': device.vendor_id,
+                'device_id': device.device_id,
+            }
+            for vendor, model, device in gpus
+        ],
+    }
+    tmp_file = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Уникальное имя: кэш могут одновременно сохранять Start Manager и отдельный Driver Manager
+        fd, tmp_file = tempfile.mkstemp(prefix=f'.{cache_file.name}.', dir=cache_file.parent)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Error saving hardware cache: {e}")
+        if tmp_file is not None:
+            try:
+                os.unlink(tmp_file)
+            except OSError:
+                pass
+
+
+class NvidiaBranchTable:
+    """Диапазоны PCI device ID видеокарт NVIDIA -> ветка драйвера, поиск бинарный."""
+
+    def __init__(self, path=NVIDIA_BRANCHES_FILE):
+        self._starts = []
+        self._entries = []
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                ranges = json.load(f)['ranges']
+            entries = sorted(
+                (int(r['first'], 16), int(r['last'], 16), r['branch'])
+                for r in ranges
+            )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Error loading NVIDIA branch table: {e}")
+            return
+
+        self._starts = [first for first, _, _ in entries]
+        self._entries = entries
+
+    def lookup(self, device_id):
+        try:
+            value = int(device_id, 16)
+        except (TypeError, ValueError):
+            return None
+
+        index = bisect.bisect_right(self._starts, value) - 1
+        if index < 0:
+            return None
+        first, last, branch = self._entries[index]
+        return branch if value <= last else None
+
+
+_nvidia_branch_table = None
+
+
+def nvidia_branch_for_device(device_id):
+    global _nvidia_branch_table
+    if _nvidia_branch_table is None:
+        _nvidia_branch_table = NvidiaBranchTable()
+    return _nvidia_branch_table.lookup(device_id)
@@ -0,0 +1,308 @@
+# Общая локализация для всех окон EN-OS System Manager.
+# Строки лежат в locales/<app>/<lang>.json и компилируются в двоичный каталог с хэш-индексом;
+# при запуске в память отображается только каталог активного языка.
+import os
+import sys
+import json
+import mmap
+import zlib
+import struct
+import tempfile
+from pathlib import Path
+from PyQt5.QtCore import QObject, pyqtSignal
+from settings import settings_store
+
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'locales')
+CATALOG_CACHE_DIR = Path.home() / '.cache' / 'enos_manager' / 'locales'
+DEFAULT_LANGUAGE = 'en'
+
+# Пользовательский locale.conf systemd важнее системного
+LOCALE_CONF_PATHS = [Path.home() / '.config' / 'locale.conf', Path('/etc/locale.conf')]
+LANGUAGE_ALIASES = {'uk': 'ru'}
+
+# Формат каталога: заголовок, таблица корзин (индекс первой записи), записи, затем строки UTF-8
+CATALOG_MAGIC = b'ENLC'
+CATALOG_VERSION = 1
+HEADER = struct.Struct('<4sHHIIQQ')   # magic, version, reserved, count, buckets, source mtime, source size
+BUCKET = struct.Struct('<I')
+ENTRY = struct.Struct('<IIIIII')       # hash, next, key offset, key length, value offset, value length
+NO_ENTRY = 0xFFFFFFFF
+
+
+def _hash(data):
+    return zlib.crc32(data)
+
+
+def compile_catalog(strings, path, source_stamp=(0, 0)):
+    """Записывает словарь key -> text в двоичный каталог path (атомарно)."""
+    items = [(key.encode('utf-8'), value.encode('utf-8')) for key, value in strings.items()]
+    bucket_count = max(8, len(items) * 2)
+    buckets = [NO_ENTRY] * bucket_count
+    entries = []
+    blob = bytearray()
+
+    strings_offset = HEADER.size + BUCKET.size * bucket_count + ENTRY.size * len(items)
+    for index, (key, value) in enumerate(items):
+        key_hash = _hash(key)
+        bucket = key_hash % bucket_count
+        key_offset = strings_offset + len(blob)
+        blob += key
+        value_offset = strings_offset + len(blob)
+        blob += value
+        entries.append((key_hash, buckets[bucket], key_offset, len(key), value_offset, len(value)))
+        buckets[bucket] = index
+
+    data = bytearray(HEADER.pack(CATALOG_MAGIC, CATALOG_VERSION, 0, len(items), bucket_count, *source_stamp))
+    for first in buckets:
+        data += BUCKET.pack(first)
+    for entry in entries:
+        data += ENTRY.pack(*entry)
+    data += blob
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Уникальное имя: один каталог могут одновременно собирать несколько процессов
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{path.name}.', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class Catalog:
+    """Каталог одного языка, отображённый в память; строки декодируются по мере запроса."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, self.count, self._bucket_count, mtime, size = HEADER.unpack_from(self._map, 0)
+        if magic != CATALOG_MAGIC or version != CATALOG_VERSION or self._bucket_count == 0:
+            self.close()
+            raise ValueError(f"{path} is not a locale catalog")
+
+        self.source_stamp = (mtime, size)
+        self._entries_offset = HEADER.size + BUCKET.size * self._bucket_count
+        self._decoded = {}
+
+    def get(self, key, default=None):
+        value = self._decoded.get(key)
+        if value is not None:
+            return value
+
+        raw_key = key.encode('utf-8')
+        key_hash = _hash(raw_key)
+        bucket_offset = HEADER.size + BUCKET.size * (key_hash % self._bucket_count)
+        index = BUCKET.unpack_from(self._map, bucket_offset)[0]
+
+        while index != NO_ENTRY:
+            entry_hash, next_index, key_offset, key_length, value_offset, value_length = \
+                ENTRY.unpack_from(self._map, self._entries_offset + ENTRY.size * index)
+            if entry_hash == key_hash and self._map[key_offset:key_offset + key_length] == raw_key:
+                value = self._map[value_offset:value_offset + value_length].decode('utf-8')
+                self._decoded[key] = value
+                return value
+            index = next_index
+
+        return default
+
+    def close(self):
+        self._map.close()
+
+
+class MemoryCatalog(dict):
+    """Запасной вариант, если каталог некуда записать."""
+
+    def close(self):
+        pass
+
+
+def available_languages(app_name, locales_dir=LOCALES_DIR):
+    try:
+        return sorted(f[:-5] for f in os.listdir(os.path.join(locales_dir, app_name)) if f.endswith('.json'))
+    except OSError:
+        return []
+
+
+def _source_stamp(source):
+    st = os.stat(source)
+    return st.st_mtime_ns, st.st_size
+
+
+def load_catalog(app_name, language):
+    """Каталог языка: собранный при упаковке, из кэша пользователя или скомпилированный заново."""
+    source = os.path.join(LOCALES_DIR, app_name, f"{language}.json")
+    stamp = _source_stamp(source)
+
+    packaged = os.path.join(LOCALES_DIR, app_name, f"{language}.cat")
+    cached = CATALOG_CACHE_DIR / app_name / f"{language}.cat"
+    for path in (packaged, cached):
+        try:
+            catalog = Catalog(path)
+        except (OSError, ValueError):
+            continue
+        if catalog.source_stamp == stamp:
+            return catalog
+        catalog.close()
+
+    # JSON разбирается только для активного языка и только при изменении исходника
+    with open(source, 'r', encoding='utf-8') as f:
+        strings = json.load(f)
+    try:
+        compile_catalog(strings, cached, stamp)
+        return Catalog(cached)
+    except OSError as e:
+        print(f"Error writing locale catalog {cached}: {e}")
+        return MemoryCatalog(strings)
+
+
+def read_locale_conf(paths=LOCALE_CONF_PATHS):
+    """Переменные из первого найденного locale.conf (строки KEY=value)."""
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            continue
+
+        values = {}
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            values[key.strip()] = value.strip().strip('"\'')
+        if values:
+            return values
+    return {}
+
+
+def match_language(locale_name, available):
+    """'ru_RU.UTF-8' -> 'ru', 'zh_CN.UTF-8' -> 'zh_CN'; None, если перевода нет."""
+    name = locale_name.split('.')[0].split('@')[0]
+    if not name or name in ('C', 'POSIX'):
+        return None
+    if name in available:
+        return name
+
+    base = name.split('_')[0].lower()
+    base = LANGUAGE_ALIASES.get(base, base)
+    if base in available:
+        return base
+    for language in available:
+        if language.startswith(base + '_'):
+            return language
+    return None
+
+
+def resolve_language(available, environ=None, conf_paths=LOCALE_CONF_PATHS):
+    """Язык интерфейса по правилам gettext: окружение, затем locale.conf."""
+    environ = os.environ if environ is None else environ
+
+    for values in (environ, None):
+        if values is None:
+            values = read_locale_conf(conf_paths)
+
+        messages = values.get('LC_ALL') or values.get('LC_MESSAGES') or values.get('LANG') or ''
+        # LANGUAGE — список через ':', gettext учитывает его, только если локаль не C
+        names = values.get('LANGUAGE', '').split(':') if messages not in ('C', 'POSIX') else []
+        for name in names + [messages]:
+            language = match_language(name, available)
+            if language:
+                return language
+
+    return DEFAULT_LANGUAGE
+
+
+class LanguageManager(QObject):
+    # Код нового языка; окна перерисовывают тексты сами, без перезапуска процесса
+    language_changed = pyqtSignal(str)
+
+    def __init__(self, app_name):
+        super().__init__()
+        self.app_name = app_name
+        self.languages = available_languages(app_name)
+        self.catalog = None
+        self.current_language = None
+        self.load_language_setting()
+        if self.current_language is None:
+            # Определённый язык сохраняется, следующие запуски уже ничего не определяют
+            self.current_language = self.detect_system_language()
+            self.save_language_setting()
+        self.load_catalog()
+        settings_store().changed.connect(self._on_setting_changed)
+
+    def detect_system_language(self):
+        return resolve_language(self.languages)
+
+    def load_language_setting(self):
+        saved_language = settings_store().get('language')
+        if saved_language in self.languages:
+            self.current_language = saved_language
+
+    def save_language_setting(self):
+        settings_store().set('language', self.current_language)
+
+    def load_catalog(self):
+        previous = self.catalog
+        try:
+            self.catalog = load_catalog(self.app_name, self.current_language)
+        except (OSError, ValueError) as e:
+            print(f"Error loading {self.current_language} locale catalog: {e}")
+            return
+        if previous is not None:
+            previous.close()
+
+    def get_text(self, key):
+        if self.catalog is None:
+            return key
+        return self.catalog.get(key, key)
+
+    def set_language(self, language):
+        if language in self.languages:
+            changed = language != self.current_language
+            self.current_language = language
+            self.save_language_setting()
+            self.load_catalog()
+            if changed:
+                self.language_changed.emit(language)
+            return True
+        return False
+
+    def _on_setting_changed(self, name):
+        # Язык сменили в другом окне этого процесса или в другом запущенном инструменте EN-OS
+        if name != 'language':
+            return
+        language = settings_store().get('language')
+        if language in self.languages and language != self.current_language:
+            self.current_language = language
+            self.load_catalog()
+            self.language_changed.emit(language)
+
+
+def compile_all(locales_dir=LOCALES_DIR):
+    """Собирает каталоги всех языков рядом с исходниками — для сборки пакета."""
+    for app_name in sorted(os.listdir(locales_dir)):
+        app_dir = os.path.join(locales_dir, app_name)
+        if not os.path.isdir(app_dir):
+            continue
+        for language in available_languages(app_name, locales_dir):
+            source = os.path.join(app_dir, f"{language}.json")
+            with open(source, 'r', encoding='utf-8') as f:
+                strings = json.load(f)
+            compile_catalog(strings, os.path.join(app_dir, f"{language}.cat"), _source_stamp(source))
+            print(f"{app_name}/{language}.cat: {len(strings)} strings")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--compile':
+        compile_all()
+    else:
+        print("Usage: localization.py --compile")
@@ -0,0 +1,200 @@
+# Общая консоль вывода для Driver Manager и Remote Assistant Creator
+import os
+from pathlib import Path
+from PyQt5.QtWidgets import QTextEdit
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QFont, QColor, QTextCursor, QTextCharFormat
+
+FLUSH_INTERVAL_MS = 33
+
+MAX_LINES = 5000
+TRIM_BATCH = 500
+SPILL_MAX_BYTES = 5 * 1024 * 1024
+LOG_DIR = Path.home() / '.config' / 'enos_manager'
+
+
+class OutputConsole(QTextEdit):
+    """Консоль, которая копит строки и вставляет их одним блоком раз в кадр."""
+
+    def __init__(self, colors, log_name=None, max_lines=MAX_LINES, parent=None):
+        super().__init__(parent)
+        self.colors = colors
+        self.max_lines = max_lines
+        self.load_older_text = "⬆️ Load older output"
+        self.setReadOnly(True)
+        self.setFont(QFont("Monospace", 9))
+
+        self.setStyleSheet(f"""
+            OutputConsole {{
+                background-color: {colors['primary']['dark']};
+                color: {colors['text']['secondary']};
+                border: 1px solid {colors['misc']['border']};
+                border-radius: 8px;
+                padding: 10px;
+                font-family: 'Monospace';
+            }}
+        """)
+
+        self._pending = []
+        self._formats = {}
+
+        # Строки, вытесненные из виджета, лежат в лог-файле; здесь хранятся только
+        # смещения пачек, чтобы "Load older" мог прочитать их обратно.
+        self._spill_path = LOG_DIR / f"{log_name}-console.log" if log_name else None
+        self._spilled_chunks = []
+        # Пачки, подгруженные обратно в начало виджета (последняя — самая верхняя)
+        self._loaded_chunks = []
+        self._loaded_lines = 0
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def append_output(self, text, color=None):
+        self._pending.append((color or self.colors['text']['secondary'], text))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self):
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+
+        # Соседние строки одного цвета вставляются одним insertText
+        runs = []
+        for color, text in pending:
+            if runs and runs[-1][0] == color:
+                runs[-1][1].append(text)
+            else:
+                runs.append((color, [text]))
+
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        for color, lines in runs:
+            cursor.insertText('\n'.join(lines) + '\n', self._char_format(color))
+        cursor.endEditBlock()
+
+        self._trim_scrollback()
+
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def clear(self):
+        self._pending = []
+        self._flush_timer.stop()
+        self._spilled_chunks = []
+        self._loaded_chunks = []
+        self._loaded_lines = 0
+        super().clear()
+
+    def has_older_output(self):
+        return bool(self._spilled_chunks)
+
+    def load_older(self):
+        if not self._spilled_chunks:
+            return False
+
+        chunk = self._spilled_chunks.pop()
+        path, offset, line_count = chunk
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                f.seek(offset)
+                lines = [f.readline().rstrip('\n') for _ in range(line_count)]
+        except OSError as e:
+            print(f"Error reading console log: {e}")
+            self._spilled_chunks = []
+            return False
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.Start)
+        cursor.insertText('\n'.join(lines) + '\n', self._char_format(self.colors['text']['muted']))
+
+        self._loaded_chunks.append(chunk)
+        self._loaded_lines += line_count
+        self.verticalScrollBar().setValue(0)
+        return True
+
+    def contextMenuEvent(self, event):
+        menu = self.createStandardContextMenu()
+        menu.addSeparator()
+        action = menu.addAction(self.load_older_text)
+        action.setEnabled(self.has_older_output())
+        action.triggered.connect(self.load_older)
+        menu.exec_(event.globalPos())
+
+    def _trim_scrollback(self):
+        if self._spill_path is None:
+            return
+
+        # Последний блок после завершающего '\n' пустой
+        line_count = self.document().blockCount() - 1
+        limit = self.max_lines + self._loaded_lines
+        if line_count <= limit + TRIM_BATCH:
+            return
+
+        # Подгруженные строки самые старые и уходят первыми; они уже есть в логе,
+        # поэтому в файл пишутся только вытесняемые новые строки
+        excess = line_count - limit
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.Start)
+        cursor.movePosition(QTextCursor.NextBlock, QTextCursor.MoveAnchor, self._loaded_lines)
+        cursor.movePosition(QTextCursor.NextBlock, QTextCursor.KeepAnchor, excess)
+        text = cursor.selection().toPlainText()
+
+        if not self._spill(text, excess):
+            return
+
+        end = cursor.position()
+        cursor.setPosition(0)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+
+        # Их пачки возвращаются в стек под только что записанной, от старых к новым
+        newest = self._spilled_chunks.pop()
+        self._spilled_chunks.extend(reversed(self._loaded_chunks))
+        self._spilled_chunks.append(newest)
+        self._loaded_chunks = []
+        self._loaded_lines = 0
+
+    def _spill(self, text, line_count):
+        try:
+            LOG_DIR.mkdir(parents=True, exist_ok=True)
+            if self._spill_path.exists() and self._spill_path.stat().st_size > SPILL_MAX_BYTES:
+                self._rotate_spill_file()
+
+            with open(self._spill_path, 'a', encoding='utf-8') as f:
+                offset = f.tell()
+                f.write(text)
+            self._spilled_chunks.append((self._spill_path, offset, line_count))
+            return True
+        except OSError as e:
+            print(f"Error writing console log: {e}")
+            return False
+
+    def _rotate_spill_file(self):
+        rotated = self._spill_path.with_name(self._spill_path.name + '.1')
+        os.replace(self._spill_path, rotated)
+        self._spilled_chunks = [
+            (rotated, offset, count)
+            for path, offset, count in self._spilled_chunks
+            if path == self._spill_path
+        ]
+        self._loaded_chunks = [
+            (rotated, offset, count)
+            for path, offset, count in self._loaded_chunks
+            if path == self._spill_path
+        ]
+
+    def _char_format(self, color):
+        char_format = self._formats.get(color)
+        if char_format is None:
+            char_format = QTextCharFormat()
+            char_format.setForeground(QColor(color))
+            self._formats[color] = char_format
+        return char_format
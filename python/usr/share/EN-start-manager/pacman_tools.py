@@ -0,0 +1,433 @@
+# Вспомогательные функции для работы с pacman: локальная база пакетов и разбор вывода
+import os
+import re
+import select
+import tarfile
+import time
+import threading
+import ctypes
+import ctypes.util
+
+PACMAN_DB_DIR = '/var/lib/pacman'
+PACMAN_LOCAL_DB = os.path.join(PACMAN_DB_DIR, 'local')
+PACMAN_SYNC_DIR = os.path.join(PACMAN_DB_DIR, 'sync')
+PACMAN_LOCK = os.path.join(PACMAN_DB_DIR, 'db.lck')
+MKINITCPIO_PRESET_DIR = '/etc/mkinitcpio.d'
+PACMAN_GNUPG_DIR = '/etc/pacman.d/gnupg'
+PACMAN_KEYRINGS_DIR = '/usr/share/pacman/keyrings'
+
+# pacman держит db.lck всё время работы. pamac-daemon и packagekitd живут в фоне и берут
+# блокировку только на время транзакции — их выдаёт лишь открытый файл блокировки
+LOCK_OWNER_PROCESSES = {'pacman'}
+
+FUSER_PID_RE = re.compile(r'\b(\d+)[a-zA-Z]*\b')
+
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+IN_MOVED_FROM = 0x00000040
+IN_DELETE = 0x00000200
+LOCK_POLL_INTERVAL = 0.5
+
+# Порядок репозиториев как в стандартном pacman.conf Arch/EN-OS
+SYNC_REPO_ORDER = ['core', 'extra', 'multilib']
+
+
+def split_package_dir(entry):
+    # Каталоги базы называются "<name>-<pkgver>-<pkgrel>", в имени пакета тоже бывают дефисы
+    parts = entry.rsplit('-', 2)
+    if len(parts) != 3:
+        return None, None
+    name, pkgver, pkgrel = parts
+    return name, f"{pkgver}-{pkgrel}"
+
+
+def read_local_packages(db_path=PACMAN_LOCAL_DB):
+    """Индекс установленных пакетов name -> version по каталогам локальной базы."""
+    installed = {}
+    try:
+        with os.scandir(db_path) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                name, version = split_package_dir(entry.name)
+                if name:
+                    installed[name] = version
+    except OSError as e:
+        print(f"Error reading pacman local database: {e}")
+    return installed
+
+
+def read_sync_versions(names, sync_dir=PACMAN_SYNC_DIR):
+    """Версии пакетов из names в синхронизированных базах репозиториев."""
+    wanted = set(names)
+    versions = {}
+
+    try:
+        databases = [f for f in os.listdir(sync_dir) if f.endswith('.db')]
+    except OSError:
+        return versions
+
+    order = {repo: i for i, repo in enumerate(SYNC_REPO_ORDER)}
+    databases.sort(key=lambda f: (order.get(f[:-3], len(order)), f))
+
+    for database in databases:
+        if not wanted:
+            break
+        try:
+            with tarfile.open(os.path.join(sync_dir, database), 'r:*') as tar:
+                for member in tar:
+                    name, version = split_package_dir(member.name.split('/', 1)[0])
+                    if name in wanted:
+                        versions[name] = version
+                        wanted.discard(name)
+                        if not wanted:
+                            break
+        except (OSError, tarfile.TarError):
+            # Например, база сжата zstd, который tarfile не читает — версия останется неизвестной
+            continue
+
+    return versions
+
+
+def filter_installed(packages, installed, available):
+    """Делит packages на (нужно установить, уже установлены в актуальной версии).
+
+    Пакет без известной версии в репозитории остаётся в плане: pacman -S --needed
+    сам не переустановит его, если версия совпадает.
+    """
+    to_install = []
+    satisfied = []
+    for package in packages:
+        local_version = installed.get(package)
+        if local_version is not None and available.get(package) == local_version:
+            satisfied.append(package)
+        else:
+            to_install.append(package)
+    return to_install, satisfied
+
+
+
+def _inotify_watch(directory):
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init1(IN_CLOEXEC | IN_NONBLOCK)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, directory.encode(), IN_DELETE | IN_MOVED_FROM) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+def wait_for_lock_release(timeout, lock_path=PACMAN_LOCK):
+    """Ждёт удаления lock-файла не дольше timeout секунд; True — файла больше нет."""
+    deadline = time.monotonic() + timeout
+    fd = _inotify_watch(os.path.dirname(lock_path))
+
+    try:
+        # Проверка после установки наблюдения, чтобы не пропустить удаление между ними
+        while os.path.exists(lock_path):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            if fd is None:
+                time.sleep(min(remaining, LOCK_POLL_INTERVAL))
+                continue
+
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if ready:
+                try:
+                    os.read(fd, 4096)
+                except BlockingIOError:
+                    pass
+        return True
+    finally:
+        if fd is not None:
+            os.close(fd)
+
+
+def process_name(pid):
+    try:
+        with open(os.path.join('/proc', str(pid), 'comm'), 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def parse_fuser_pids(lines, lock_path=PACMAN_LOCK):
+    """PID из вывода 'fuser <файл>' (имя файла идёт в stderr, PID с буквой доступа — в stdout)."""
+    text = ' '.join(line.replace(lock_path + ':', ' ') for line in lines)
+    return [int(pid) for pid in FUSER_PID_RE.findall(text)]
+
+
+def pacman_lock_holders(lock_path=PACMAN_LOCK):
+    """Список (pid, имя) процессов pacman и процессов, у которых lock-файл открыт.
+
+    Дескрипторы чужих root-процессов отсюда не видны: их проверяют от root через fuser.
+    """
+    holders = []
+    own_pid = os.getpid()
+
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit() or int(entry) == own_pid:
+            continue
+        proc_dir = os.path.join('/proc', entry)
+
+        name = process_name(entry)
+        if name is None:
+            continue
+
+        if name in LOCK_OWNER_PROCESSES:
+            holders.append((int(entry), name))
+            continue
+
+        try:
+            fds = os.listdir(os.path.join(proc_dir, 'fd'))
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                if os.readlink(os.path.join(proc_dir, 'fd', fd)) == lock_path:
+                    holders.append((int(entry), name))
+                    break
+            except OSError:
+                continue
+
+    return holders
+
+
+
+def keyring_state(keyring='archlinux', gnupg_dir=PACMAN_GNUPG_DIR, keyrings_dir=PACMAN_KEYRINGS_DIR):
+    """Какой шаг pacman-key нужен: 'init', 'populate' или None, если связка ключей актуальна."""
+    mtimes = []
+    for names in (('trustdb.gpg',), ('pubring.kbx', 'pubring.gpg')):
+        for name in names:
+            try:
+                mtimes.append(os.stat(os.path.join(gnupg_dir, name)).st_mtime_ns)
+                break
+            except OSError:
+                continue
+        else:
+            return 'init'
+
+    # Пакет *-keyring обновляет файл в keyrings_dir; populate переписывает trustdb и pubring
+    try:
+        keyring_mtime = os.stat(os.path.join(keyrings_dir, f"{keyring}.gpg")).st_mtime_ns
+    except OSError:
+        return None
+    return 'populate' if keyring_mtime > min(mtimes) else None
+
+
+def preset_name(preset_path):
+    name = os.path.basename(preset_path)
+    return name[:-len('.preset')] if name.endswith('.preset') else name
+
+
+def list_mkinitcpio_presets(preset_dir=MKINITCPIO_PRESET_DIR):
+    try:
+        return sorted(preset_name(f) for f in os.listdir(preset_dir) if f.endswith('.preset'))
+    except OSError:
+        return []
+
+
+def initramfs_affecting_packages(packages):
+    # В initramfs попадают только модули ядра; mesa/vulkan и утилиты его не меняют
+    return [package for package in packages if package.endswith('-dkms')]
+
+
+def presets_for_dkms(presets, installed):
+    """Пресеты ядер, для которых DKMS соберёт модуль (установлены заголовки ядра)."""
+    with_headers = [preset for preset in presets if f"{preset}-headers" in installed]
+    return with_headers or presets
+
+
+# Доли этапов внутри одной команды: (начало, конец) от 0 до 1
+PHASE_STAGES = {
+    'update': {'download': (0.0, 0.4), 'check': (0.4, 0.45), 'packages': (0.45, 0.9), 'hooks': (0.9, 1.0)},
+    'download': {'download': (0.0, 1.0)},
+    'install': {'check': (0.0, 0.1), 'packages': (0.1, 0.85), 'hooks': (0.85, 1.0)},
+    'initramfs': {'presets': (0.0, 1.0)},
+    'grub': {},
+}
+
+CHECK_STEPS = [
+    'checking keyring',
+    'checking keys in keyring',
+    'checking package integrity',
+    'loading package files',
+    'checking for file conflicts',
+    'checking available disk space',
+]
+
+PACKAGES_RE = re.compile(r'^Packages \((\d+)\)')
+DOWNLOAD_SIZE_RE = re.compile(r'^Total Download Size:\s+([\d.,]+\s+\S+)')
+DOWNLOAD_RE = re.compile(r'^\s*(\S+) downloading\.\.\.$')
+CHECK_RE = re.compile(r'^(?:\(\d+/\d+\)\s+)?(' + '|'.join(re.escape(s) for s in CHECK_STEPS) + r')')
+OPERATION_RE = re.compile(
+    r'^(?:\((\d+)/(\d+)\)\s+)?(installing|upgrading|reinstalling|downgrading|removing) (\S+?)(?:\.\.\.)?(?:\s|$)'
+)
+HOOKS_START_RE = re.compile(r'^:: Running post-transaction hooks')
+COUNTER_RE = re.compile(r'^\((\d+)/(\d+)\) ')
+PRESET_RE = re.compile(r"^==> Building image from preset: (\S+): '(\S+)'")
+IMAGE_OK_RE = re.compile(r'^==> Image generation successful')
+
+
+class InstallProgress:
+    """Переводит вывод pacman и mkinitcpio в общий монотонный процент установки.
+
+    feed можно вызывать из нескольких потоков (параллельные mkinitcpio -p): общий
+    процент защищён блокировкой, а собираемый образ отслеживается для каждого потока.
+    """
+
+    def __init__(self, phases, emit):
+        self.emit = emit
+        self.value = 0
+        self._ranges = {}
+        self._lock = threading.RLock()
+        # Пресет -> собраны ли все его образы (в том числе хуками pacman)
+        self._preset_results = {}
+        # Поток -> пресет, образ которого он сейчас собирает
+        self._building = {}
+
+        total_weight = sum(weight for _, weight in phases) or 1
+        start = 0.0
+        for name, weight in phases:
+            end = start + weight * 100.0 / total_weight
+            self._ranges[name] = (start, end)
+            start = end
+
+        self._phase = None
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self.package_total = 0
+        self.download_size = None
+        self.expected_presets = 0
+        self._downloaded = 0
+        self._operations = 0
+        self._presets = 0
+        self._in_hooks = False
+
+    @property
+    def built_presets(self):
+        """Пресеты, у которых успешно собран каждый образ."""
+        with self._lock:
+            return {preset for preset, ok in self._preset_results.items() if ok}
+
+    def start_phase(self, name, message=""):
+        with self._lock:
+            self._finish_images()
+            if name == 'install':
+                # Считаются только сборки хуком после установки драйверов, а не во время -Syu
+                self._preset_results.clear()
+            self._phase = name
+            self._reset_counters()
+            self._set_fraction(0.0, message)
+
+    def finish_phase(self):
+        with self._lock:
+            self._finish_images()
+            if self._phase is not None:
+                self._set_fraction(1.0)
+            self._phase = None
+
+    def feed(self, line):
+        """Обрабатывает строку вывода; True — строка заменена собственным сообщением."""
+        with self._lock:
+            if self._phase is None:
+                return False
+            return self._feed(line)
+
+    def _record_image(self, preset, ok):
+        self._preset_results[preset] = self._preset_results.get(preset, True) and ok
+
+    def _finish_images(self):
+        # Образ без "Image generation successful" не собрался
+        for preset in self._building.values():
+            self._record_image(preset, False)
+        self._building.clear()
+
+    def _feed(self, line):
+
+        match = PACKAGES_RE.match(line)
+        if match:
+            self.package_total = int(match.group(1))
+            return False
+
+        match = DOWNLOAD_SIZE_RE.match(line)
+        if match:
+            self.download_size = match.group(1)
+            return False
+
+        match = DOWNLOAD_RE.match(line)
+        if match and not match.group(1).endswith('.sig'):
+            self._downloaded += 1
+            total = max(self.package_total, self._downloaded)
+            size = f" [{self.download_size}]" if self.download_size else ""
+            self._set_stage('download', self._downloaded / total,
+                            f"⬇️ ({self._downloaded}/{total}){size} {match.group(1)}")
+            return True
+
+        match = CHECK_RE.match(line)
+        if match:
+            step = CHECK_STEPS.index(match.group(1))
+            self._set_stage('check', (step + 1) / len(CHECK_STEPS))
+            return False
+
+        match = OPERATION_RE.match(line)
+        if match:
+            self._operations += 1
+            if match.group(1):
+                current, total = int(match.group(1)), int(match.group(2))
+            else:
+                current, total = self._operations, max(self.package_total, self._operations)
+            self._set_stage('packages', current / total,
+                            f"📦 ({current}/{total}) {match.group(3)} {match.group(4)}")
+            return True
+
+        if HOOKS_START_RE.match(line):
+            self._in_hooks = True
+            self._set_stage('hooks', 0.0)
+            return False
+
+        if IMAGE_OK_RE.match(line):
+            preset = self._building.pop(threading.get_ident(), None)
+            if preset:
+                self._record_image(preset, True)
+            return False
+
+        match = PRESET_RE.match(line)
+        if match:
+            thread = threading.get_ident()
+            if thread in self._building:
+                self._record_image(self._building[thread], False)
+            self._building[thread] = preset_name(match.group(1))
+            self._presets += 1
+            if self.expected_presets:
+                fraction = min(self._presets / self.expected_presets, 1.0)
+            else:
+                fraction = self._presets / (self._presets + 1)
+            self._set_stage('presets', fraction)
+            return False
+
+        match = COUNTER_RE.match(line)
+        if match and self._in_hooks:
+            self._set_stage('hooks', int(match.group(1)) / max(int(match.group(2)), 1))
+        return False
+
+    def _set_stage(self, stage, fraction, message=""):
+        stages = PHASE_STAGES.get(self._phase, {})
+        if stage not in stages:
+            return
+        start, end = stages[stage]
+        self._set_fraction(start + (end - start) * min(fraction, 1.0), message)
+
+    def _set_fraction(self, fraction, message=""):
+        start, end = self._ranges.get(self._phase, (self.value, self.value))
+        value = max(self.value, int(start + (end - start) * fraction))
+        if value != self.value or message:
+            self.value = value
+            self.emit(value, message)
@@ -0,0 +1,247 @@
+# Долгоживущий процесс с правами root: запускается один раз через sudo и выполняет
+# команды GUI без повторной аутентификации. Обмен — строки JSON через stdin/stdout:
+#   запрос  {"id": 1, "command": ["pacman", "-S", ...]}
+#   отмена  {"id": 1, "signal": "TERM"}
+#   ответ   {"id": 1, "line": "..."} ... {"id": 1, "exit": 0}
+# Когда GUI закрывается, stdin получает EOF: помощник дожидается уже запущенных команд
+# (прерванный pacman оставил бы базу в полуобновлённом виде) и выходит.
+import os
+import sys
+import json
+import queue
+import signal
+import itertools
+import threading
+import subprocess
+
+HELPER_PATH = os.path.abspath(__file__)
+START_TIMEOUT = 15
+KILL_TIMEOUT = 10
+# Так sudo (в локали C) сообщает о неверном пароле, после чего снова ждёт его в stdin
+AUTH_FAILED_MARKERS = ('Sorry, try again', 'incorrect password attempt')
+
+
+def _terminate_group(process):
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=KILL_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+    except OSError:
+        pass
+
+
+def serve(stdin=sys.stdin, stdout=sys.stdout):
+    write_lock = threading.Lock()
+    processes = {}
+    threads = []
+
+    def send(message):
+        with write_lock:
+            try:
+                stdout.write(json.dumps(message, ensure_ascii=False) + '\n')
+                stdout.flush()
+            except (OSError, ValueError):
+                # GUI уже закрылся; вывод команды всё равно вычитывается до конца
+                pass
+
+    def run_request(request_id, command):
+        try:
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors='replace',
+                bufsize=1,
+                start_new_session=True
+            )
+        except OSError as e:
+            send({'id': request_id, 'line': f"{command[0]}: {e.strerror}"})
+            send({'id': request_id, 'exit': 127})
+            return
+
+        processes[request_id] = process
+        for line in process.stdout:
+            send({'id': request_id, 'line': line.rstrip('\n')})
+        process.stdout.close()
+        return_code = process.wait()
+        processes.pop(request_id, None)
+        send({'id': request_id, 'exit': return_code})
+
+    send({'ready': True})
+
+    for raw in stdin:
+        try:
+            request = json.loads(raw)
+        except ValueError:
+            # Сюда попадает строка пароля, если sudo не стал его спрашивать
+            continue
+        if not isinstance(request, dict) or 'id' not in request:
+            continue
+
+        if 'signal' in request:
+            process = processes.get(request['id'])
+            if process is not None:
+                threading.Thread(target=_terminate_group, args=(process,), daemon=True).start()
+        elif isinstance(request.get('command'), list) and request['command']:
+            thread = threading.Thread(target=run_request, args=(request['id'], request['command']), daemon=True)
+            thread.start()
+            threads.append(thread)
+
+    for thread in threads:
+        thread.join()
+
+
+class RootHelper:
+    """Клиентская сторона: один процесс sudo на всю сессию GUI."""
+
+    def __init__(self, process):
+        self.process = process
+        self._ids = itertools.count(1)
+        self._queues = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._alive = True
+        self.auth_failed = False
+
+        self._reader = threading.Thread(target=self._read_responses, daemon=True)
+        self._reader.start()
+        self._error_reader = threading.Thread(target=self._read_errors, daemon=True)
+        self._error_reader.start()
+
+    @classmethod
+    def start(cls, password):
+        """Запускает помощника через sudo; None, если он не запустился или не ответил.
+
+        Это и есть проверка пароля: PAM проходится один раз, на запуске помощника.
+        Неверный пароль — PermissionError.
+        """
+        # Сообщения sudo — в локали C, а командам помощник вернёт локаль пользователя
+        env = dict(os.environ, LC_ALL='C')
+        try:
+            process = subprocess.Popen(
+                ["sudo", "-S", "-p", "", sys.executable, HELPER_PATH, os.environ.get('LC_ALL', '')],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+                env=env
+            )
+            process.stdin.write((password or '') + '\n')
+            process.stdin.flush()
+        except OSError as e:
+            print(f"Error starting root helper: {e}")
+            return None
+
+        helper = cls(process)
+        ready = helper._ready.wait(START_TIMEOUT)
+        if helper.auth_failed:
+            helper.close()
+            raise PermissionError("sudo rejected the password")
+        if not ready or not helper.is_alive():
+            helper.close()
+            return None
+        return helper
+
+    def is_alive(self):
+        return self._alive and self.process.poll() is None
+
+    def run(self, command, on_line, idle_timeout=600):
+        """Выполняет команду от root и возвращает код выхода; строки вывода уходят в on_line."""
+        request_id = next(self._ids)
+        responses = queue.Queue()
+        with self._lock:
+            if not self._alive:
+                raise OSError("Root helper is not running")
+            self._queues[request_id] = responses
+
+        try:
+            self._send({'id': request_id, 'command': list(command)})
+            cancelled = False
+            while True:
+                try:
+                    # Таймаут простоя: ждём следующую строку не дольше idle_timeout
+                    message = responses.get(timeout=idle_timeout if not cancelled else None)
+                except queue.Empty:
+                    self._send({'id': request_id, 'signal': 'TERM'})
+                    cancelled = True
+                    continue
+
+                if message is None:
+                    raise OSError("Root helper exited unexpectedly")
+                if 'line' in message:
+                    on_line(message['line'])
+                elif 'exit' in message:
+                    if cancelled:
+                        raise subprocess.TimeoutExpired(command, idle_timeout)
+                    return message['exit']
+        finally:
+            with self._lock:
+                self._queues.pop(request_id, None)
+
+    def close(self):
+        """Закрывает stdin помощника и ждёт его выхода; запущенные команды он доделает сам."""
+        self._alive = False
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(timeout=KILL_TIMEOUT + 5)
+        except subprocess.TimeoutExpired:
+            # Команда ещё идёт; убивать sudo нельзя — помощник завершится после неё
+            pass
+
+    def _send(self, message):
+        with self._write_lock:
+            self.process.stdin.write(json.dumps(message, ensure_ascii=False) + '\n')
+            self.process.stdin.flush()
+
+    def _read_errors(self):
+        for line in self.process.stderr:
+            if not self._ready.is_set() and any(marker in line for marker in AUTH_FAILED_MARKERS):
+                # sudo ждёт следующую попытку; close() закроет stdin, и он завершится
+                self.auth_failed = True
+                self._ready.set()
+
+    def _read_responses(self):
+        for raw in self.process.stdout:
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                continue
+            if message.get('ready'):
+                self._ready.set()
+                continue
+            with self._lock:
+                responses = self._queues.get(message.get('id'))
+            if responses is not None:
+                responses.put(message)
+
+        # Помощник завершился: будим всех, кто ждёт ответа
+        with self._lock:
+            self._alive = False
+            waiting = list(self._queues.values())
+        for responses in waiting:
+            responses.put(None)
+        self._ready.set()
+
+
+if __name__ == '__main__':
+    if os.geteuid() != 0:
+        print("root_helper must be started as root", file=sys.stderr)
+        sys.exit(1)
+    # Аргумент — LC_ALL пользователя: sudo запускался с LC_ALL=C
+    if len(sys.argv) > 1:
+        if sys.argv[1]:
+            os.environ['LC_ALL'] = sys.argv[1]
+        else:
+            os.environ.pop('LC_ALL', None)
+    serve()
@@ -0,0 +1,163 @@
+# Общие настройки EN-OS System Manager (~/.config/enos_manager/settings.json).
+# Файл читается один раз на процесс, изменения пишутся с задержкой и атомарно,
+# а правки из других запущенных инструментов EN-OS подхватываются через QFileSystemWatcher.
+import os
+import json
+import tempfile
+from pathlib import Path
+from dataclasses import dataclass, field, fields
+from PyQt5.QtCore import QObject, QTimer, QCoreApplication, QFileSystemWatcher, pyqtSignal
+
+SETTINGS_FILE = Path.home() / '.config' / 'enos_manager' / 'settings.json'
+SAVE_DELAY_MS = 500
+
+
+@dataclass
+class Settings:
+    language: str = None
+    # Ключи, о которых эта версия не знает, сохраняются как есть
+    extra: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            return cls()
+        language = data.get('language')
+        return cls(
+            language=language if isinstance(language, str) else None,
+            extra={key: value for key, value in data.items() if key not in SETTING_NAMES},
+        )
+
+    def to_dict(self):
+        data = dict(self.extra)
+        if self.language is not None:
+            data['language'] = self.language
+        return data
+
+
+SETTING_NAMES = [f.name for f in fields(Settings) if f.name != 'extra']
+
+
+class SettingsStore(QObject):
+    # Имя изменившейся настройки — и при своих изменениях, и при правке файла извне
+    changed = pyqtSignal(str)
+
+    def __init__(self, path=SETTINGS_FILE):
+        super().__init__()
+        self.path = Path(path)
+        self._dirty = set()
+        self._stamp = self._file_stamp()
+        self.settings = self._read()
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.flush)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_file_changed)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watch()
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+
+    def get(self, name):
+        return getattr(self.settings, name)
+
+    def set(self, name, value):
+        if getattr(self.settings, name) == value:
+            return
+        setattr(self.settings, name, value)
+        self._dirty.add(name)
+
+        if QCoreApplication.instance() is not None:
+            self._save_timer.start()
+        else:
+            self.flush()
+        self.changed.emit(name)
+
+    def flush(self):
+        self._save_timer.stop()
+        if not self._dirty:
+            return
+
+        # Файл могли изменить после последнего чтения: сверху кладутся только свои изменения
+        if self._file_stamp() != self._stamp:
+            self.settings = self._merge(self._read())
+
+        tmp_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Уникальное имя: файл одновременно сохраняют несколько инструментов EN-OS
+            fd, tmp_path = tempfile.mkstemp(prefix=f'.{self.path.name}.', dir=self.path.parent)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.settings.to_dict(), f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving settings: {e}")
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+            return
+
+        self._dirty.clear()
+        self._stamp = self._file_stamp()
+        self._watch()
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return Settings.from_dict(json.load(f))
+        except FileNotFoundError:
+            return Settings()
+        except (OSError, ValueError) as e:
+            print(f"Error loading settings: {e}")
+            return Settings()
+
+    def _merge(self, fresh):
+        for name in self._dirty:
+            setattr(fresh, name, getattr(self.settings, name))
+        return fresh
+
+    def _file_stamp(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size, st.st_ino
+        except OSError:
+            return None
+
+    def _watch(self):
+        # Атомарная замена создаёт новый файл, поэтому следим и за каталогом
+        for path in (self.path.parent, self.path):
+            if path.exists() and str(path) not in self._watcher.files() + self._watcher.directories():
+                self._watcher.addPath(str(path))
+
+    def _on_file_changed(self, _path):
+        self._watch()
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+        self._stamp = stamp
+
+        previous = self.settings
+        self.settings = self._merge(self._read())
+        for name in SETTING_NAMES:
+            if getattr(previous, name) != getattr(self.settings, name):
+                self.changed.emit(name)
+
+
+_store = None
+
+
+def settings_store():
+    """Единственное хранилище настроек процесса."""
+    global _store
+    if _store is None:
+        _store = SettingsStore()
+    return _store
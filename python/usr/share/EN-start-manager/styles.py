@@ -0,0 +1,84 @@
+# Общий реестр таблиц стилей: QSS собирается один раз и добавляется к стилю приложения,
+# а виджеты выбирают свои правила через динамические свойства, без setStyleSheet на каждом.
+from PyQt5.QtWidgets import QApplication, QStyle, QStyleOptionButton, QStylePainter
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap, QFont, QFontDatabase
+
+APP_FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+_stylesheets = {}
+_app_font_loaded = False
+
+
+def load_app_font(path=APP_FONT_PATH, size=9):
+    """Шрифт по умолчанию для всех окон процесса; файл регистрируется только при первом вызове."""
+    global _app_font_loaded
+    if _app_font_loaded:
+        return
+    _app_font_loaded = True
+
+    font_id = QFontDatabase.addApplicationFont(path)
+    if font_id != -1:
+        font_family = QFontDatabase.applicationFontFamilies(font_id)[0]
+        QApplication.setFont(QFont(font_family, size))
+
+
+def button_selector(namespace, scheme):
+    # namespace разделяет одноимённые классы MinimalButton разных окон в одном процессе
+    return f'MinimalButton[buttonStyle="{namespace}"][colorScheme="{scheme}"]'
+
+
+def register_stylesheet(key, build):
+    """Добавляет QSS к приложению при первом вызове с этим key; build больше не вызывается."""
+    if key in _stylesheets:
+        return _stylesheets[key]
+
+    stylesheet = build()
+    _stylesheets[key] = stylesheet
+
+    app = QApplication.instance()
+    if app is not None:
+        app.setStyleSheet(app.styleSheet() + stylesheet)
+    return stylesheet
+
+
+def apply_button_style(button, namespace, scheme):
+    button.setProperty('buttonStyle', namespace)
+    button.setProperty('colorScheme', scheme)
+    # Правила по свойствам применяются при полировке; уже показанную кнопку перерисовываем
+    if button.testAttribute(Qt.WA_WState_Polished):
+        button.style().unpolish(button)
+        button.style().polish(button)
+
+
+class ButtonPixmapCache:
+    """Изображения кнопки по состояниям: кадры анимации рисуют готовую картинку, а не стиль."""
+
+    MAX_STATES = 8
+
+    def __init__(self, button):
+        self.button = button
+        self._pixmaps = {}
+
+    def pixmap(self):
+        option = QStyleOptionButton()
+        self.button.initStyleOption(option)
+        ratio = self.button.devicePixelRatioF()
+        key = (int(option.state), option.text, option.rect.width(), option.rect.height(), ratio)
+
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            if len(self._pixmaps) >= self.MAX_STATES:
+                self._pixmaps.clear()
+            pixmap = QPixmap(round(option.rect.width() * ratio), round(option.rect.height() * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            # То же, что делает QPushButton.paintEvent, но в картинку
+            painter = QStylePainter(pixmap, self.button)
+            painter.drawControl(QStyle.CE_PushButton, option)
+            painter.end()
+            self._pixmaps[key] = pixmap
+        return pixmap
+
+    def clear(self):
+        self._pixmaps.clear()